@@ -8,33 +8,63 @@ Supports batch conversion with multiple files or zip upload
 
 import os
 import io
+import re
+import json
+import multiprocessing
+import queue
+import uuid
 import tempfile
 import zipfile
 import shutil
 import atexit
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from functools import wraps
-from flask import Flask, render_template, request, send_file, jsonify
+from urllib.parse import quote
+from flask import Flask, Request, Response, render_template, request, send_file, jsonify
 from werkzeug.utils import secure_filename
 from md_to_docx import MarkdownToDocxConverter
 from docx_to_md import DocxToMarkdownConverter
 
+# Optional ISA-L DEFLATE (SIMD accelerated, zlib compatible) for zip upload/download
+try:
+    from isal import isal_zlib
+    zipfile.zlib = isal_zlib
+except ImportError:
+    pass
+
 # File magic bytes for content validation
 FILE_SIGNATURES = {
-    'docx': [b'PK\x03\x04'],  # ZIP-based format (DOCX, XLSX, etc.)
-    'pdf': [b'%PDF'],
-    'zip': [b'PK\x03\x04', b'PK\x05\x06'],  # Standard ZIP and empty ZIP
+    'docx': (b'PK\x03\x04',),  # ZIP-based format (DOCX, XLSX, etc.)
+    'pdf': (b'%PDF',),
+    'zip': (b'PK\x03\x04', b'PK\x05\x06'),  # Standard ZIP and empty ZIP
 }
 
-# Rate limiting storage
-_rate_limit_store = {}
-_rate_limit_lock = threading.Lock()
+# Error message fragments that may leak internal details (see sanitize_error_message)
+SENSITIVE_ERROR_PATTERN = re.compile('|'.join(map(re.escape, [
+    'traceback', 'file "/', 'line ', 'in <module>',
+    '/home/', '/users/', 'c:\\', 'd:\\', 'password',
+    'secret', 'key', 'token', 'credential'
+])), re.IGNORECASE)
+
+# Rate limiting storage (client IP -> [tokens, last refill time]), split into
+# independently locked shards so requests from different clients don't contend
+_RATE_LIMIT_SHARDS = 32  # Power of two (shard index is a bit mask)
+_rate_limit_shards = [({}, threading.Lock()) for _ in range(_RATE_LIMIT_SHARDS)]
+
+# Queued batch jobs (job_id -> job state)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+# Process pool for CPU-bound batch conversions (created on first use)
+_process_pool = None
+_process_pool_lock = threading.Lock()
 
-# Temp directories to clean up
+# Temp dirs handed off to responses/jobs that outlive the request; removed at exit if still
+# present. Plain set add/discard are atomic under the GIL, so no lock is needed.
 _temp_dirs_to_cleanup = set()
-_cleanup_lock = threading.Lock()
 
 # PDF converters - imported lazily to handle missing GTK+ on Windows
 MarkdownToPdfConverter = None
@@ -49,10 +79,27 @@ DocxToTexConverter = None
 TexToDocxConverter = None
 PdfToTexConverter = None
 
+# Converter name (as used in CONVERSIONS) -> class; the lazy loaders add theirs
+_converter_classes = {
+    'MarkdownToDocxConverter': MarkdownToDocxConverter,
+    'DocxToMarkdownConverter': DocxToMarkdownConverter,
+}
+
+# Set once the lazily loaded converters import successfully
+_PDF_OK = False
+_TEX_OK = False
+
+# Guards the lazy converter imports against concurrent requests
+_converter_load_lock = threading.Lock()
+
 def _load_pdf_converters():
     """Load PDF converters lazily"""
-    global MarkdownToPdfConverter, PdfToMarkdownConverter, DocxToPdfConverter, PdfToDocxConverter
-    if MarkdownToPdfConverter is None:
+    global MarkdownToPdfConverter, PdfToMarkdownConverter, DocxToPdfConverter, PdfToDocxConverter, _PDF_OK
+    if MarkdownToPdfConverter is not None:
+        return True
+    with _converter_load_lock:
+        if MarkdownToPdfConverter is not None:
+            return True
         try:
             from md_to_pdf import MarkdownToPdfConverter as _MdToPdf
             from pdf_to_md import PdfToMarkdownConverter as _PdfToMd
@@ -62,19 +109,29 @@ def _load_pdf_converters():
             PdfToMarkdownConverter = _PdfToMd
             DocxToPdfConverter = _DocxToPdf
             PdfToDocxConverter = _PdfToDocx
+            _converter_classes.update({
+                'MarkdownToPdfConverter': _MdToPdf,
+                'PdfToMarkdownConverter': _PdfToMd,
+                'DocxToPdfConverter': _DocxToPdf,
+                'PdfToDocxConverter': _PdfToDocx,
+            })
+            _PDF_OK = True
             return True
         except Exception as e:
             print(f"Warning: PDF converters not available: {e}")
             print("To enable PDF support on Windows, install GTK+ runtime:")
             print("  https://github.com/nickvidal/msys2/wiki/MSYS2-installation")
             return False
-    return True
 
 
 def _load_tex_converters():
     """Load LaTeX converters lazily"""
-    global MarkdownToTexConverter, TexToMarkdownConverter, DocxToTexConverter, TexToDocxConverter, PdfToTexConverter
-    if MarkdownToTexConverter is None:
+    global MarkdownToTexConverter, TexToMarkdownConverter, DocxToTexConverter, TexToDocxConverter, PdfToTexConverter, _TEX_OK
+    if MarkdownToTexConverter is not None:
+        return True
+    with _converter_load_lock:
+        if MarkdownToTexConverter is not None:
+            return True
         try:
             from md_to_tex import MarkdownToTexConverter as _MdToTex
             from tex_to_md import TexToMarkdownConverter as _TexToMd
@@ -86,19 +143,52 @@ def _load_tex_converters():
             DocxToTexConverter = _DocxToTex
             TexToDocxConverter = _TexToDocx
             PdfToTexConverter = _PdfToTex
+            _converter_classes.update({
+                'MarkdownToTexConverter': _MdToTex,
+                'TexToMarkdownConverter': _TexToMd,
+                'DocxToTexConverter': _DocxToTex,
+                'TexToDocxConverter': _TexToDocx,
+                'PdfToTexConverter': _PdfToTex,
+            })
+            _TEX_OK = True
             return True
         except Exception as e:
             print(f"Warning: LaTeX converters not available: {e}")
             return False
-    return True
+
+
+def _preload_converters():
+    """Import the lazily loaded converters ahead of the first request that needs them"""
+    _load_pdf_converters()
+    _load_tex_converters()
+
+
+class UploadRequest(Request):
+    """Request that spools uploaded files to disk once they outgrow a small buffer"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=app.config['UPLOAD_SPOOL_SIZE'], mode='rb+')
+
 
 app = Flask(__name__)
+app.request_class = UploadRequest
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max for batch uploads
+app.config['UPLOAD_SPOOL_SIZE'] = 64 * 1024  # Uploads larger than this are spooled to disk
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 app.config['MAX_SINGLE_FILE_SIZE'] = 16 * 1024 * 1024  # 16MB max for single files
 app.config['RATE_LIMIT_REQUESTS'] = 30  # Max requests per window
 app.config['RATE_LIMIT_WINDOW'] = 60  # Window in seconds
+app.config['RATE_LIMIT_IDLE_TIMEOUT'] = 10 * 60  # Forget clients idle this long (seconds)
+app.config['RATE_LIMIT_EVICT_INTERVAL'] = 60  # How often idle clients are evicted (seconds)
 app.config['MAX_ZIP_RATIO'] = 100  # Max decompression ratio (ZIP bomb protection)
+app.config['MAX_ZIP_EXTRACTED_SIZE'] = 100 * 1024 * 1024  # Max total bytes extracted from one ZIP
+app.config['MAX_BATCH_WORKERS'] = 8  # Max parallel conversions per batch request
+app.config['MAX_EXTRACT_WORKERS'] = 4  # Max parallel zip member extractions
+app.config['BATCH_PROCESS_WORKERS'] = os.cpu_count() or 2  # Processes for PDF conversions (0 = threads only)
+app.config['JOB_RETENTION'] = 60 * 60  # Seconds to keep undownloaded batch job results
+app.config['X_ACCEL_REDIRECT_DIR'] = os.environ.get('X_ACCEL_REDIRECT_DIR')  # nginx internal dir (None = send from Flask)
+app.config['X_ACCEL_REDIRECT_PREFIX'] = '/_send/'  # URL prefix of that nginx internal location
+app.config['X_ACCEL_REDIRECT_RETENTION'] = 10 * 60  # Seconds handed-off downloads are kept
 
 # Supported file extensions
 MARKDOWN_EXTENSIONS = {'md', 'markdown', 'txt'}
@@ -107,148 +197,256 @@ PDF_EXTENSIONS = {'pdf'}
 TEX_EXTENSIONS = {'tex', 'latex'}
 ZIP_EXTENSIONS = {'zip'}
 ALLOWED_EXTENSIONS = MARKDOWN_EXTENSIONS | DOCX_EXTENSIONS | PDF_EXTENSIONS | TEX_EXTENSIONS | ZIP_EXTENSIONS
+ALLOWED_SUFFIXES = tuple(f'.{ext}' for ext in sorted(ALLOWED_EXTENSIONS))  # For str.endswith
+
+# File extension -> source format
+EXTENSION_FORMATS = {
+    **{ext: 'md' for ext in MARKDOWN_EXTENSIONS},
+    **{ext: 'docx' for ext in DOCX_EXTENSIONS},
+    **{ext: 'pdf' for ext in PDF_EXTENSIONS},
+    **{ext: 'tex' for ext in TEX_EXTENSIONS},
+    **{ext: 'zip' for ext in ZIP_EXTENSIONS},
+}
+CONVERTIBLE_FORMATS = {'md', 'docx', 'pdf', 'tex'}
+
+# Default target format for each source format
+DEFAULT_TARGET_FORMATS = {
+    'md': 'docx',
+    'docx': 'md',
+    'pdf': 'md',
+    'tex': 'md',
+}
+
+# (source format, target format) -> (converter name, output subfolder, output extension, direction)
+CONVERSIONS = {
+    ('md', 'docx'): ('MarkdownToDocxConverter', 'DOCX', '.docx', 'md_to_docx'),
+    ('md', 'pdf'): ('MarkdownToPdfConverter', 'PDF', '.pdf', 'md_to_pdf'),
+    ('md', 'tex'): ('MarkdownToTexConverter', 'TEX', '.tex', 'md_to_tex'),
+    ('docx', 'md'): ('DocxToMarkdownConverter', 'MD', '.md', 'docx_to_md'),
+    ('docx', 'pdf'): ('DocxToPdfConverter', 'PDF', '.pdf', 'docx_to_pdf'),
+    ('docx', 'tex'): ('DocxToTexConverter', 'TEX', '.tex', 'docx_to_tex'),
+    ('pdf', 'md'): ('PdfToMarkdownConverter', 'MD', '.md', 'pdf_to_md'),
+    ('pdf', 'docx'): ('PdfToDocxConverter', 'DOCX', '.docx', 'pdf_to_docx'),
+    ('pdf', 'tex'): ('PdfToTexConverter', 'TEX', '.tex', 'pdf_to_tex'),
+    ('tex', 'md'): ('TexToMarkdownConverter', 'MD', '.md', 'tex_to_md'),
+    ('tex', 'docx'): ('TexToDocxConverter', 'DOCX', '.docx', 'tex_to_docx'),
+}
+
+# Output subfolder for each conversion direction
+DIRECTION_SUBDIRS = {direction: subdir for _, subdir, _, direction in CONVERSIONS.values()}
+
+# MIME type of the output for each conversion direction
+DIRECTION_MIMETYPES = {
+    'md_to_docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'md_to_pdf': 'application/pdf',
+    'md_to_tex': 'application/x-tex',
+    'docx_to_md': 'text/markdown',
+    'docx_to_pdf': 'application/pdf',
+    'docx_to_tex': 'application/x-tex',
+    'pdf_to_md': 'text/markdown',
+    'pdf_to_docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'pdf_to_tex': 'application/x-tex',
+    'tex_to_md': 'text/markdown',
+    'tex_to_docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+# Output subfolders created by batch conversion
+OUTPUT_SUBDIRS = ('MD', 'DOCX', 'PDF', 'TEX')
+
+# Outputs that are already compressed internally and are stored as-is in zips
+PRECOMPRESSED_EXTENSIONS = DOCX_EXTENSIONS | PDF_EXTENSIONS
 
 
 def cleanup_temp_dirs():
     """Clean up temporary directories on exit"""
-    with _cleanup_lock:
-        for temp_dir in list(_temp_dirs_to_cleanup):
-            try:
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir, ignore_errors=True)
-            except Exception:
-                pass
-        _temp_dirs_to_cleanup.clear()
+    for temp_dir in list(_temp_dirs_to_cleanup):
+        try:
+            if os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        except Exception:
+            pass
+    _temp_dirs_to_cleanup.clear()
 
 
 # Register cleanup function
 atexit.register(cleanup_temp_dirs)
 
+# Warm the PDF/LaTeX imports in the background (runs in each gunicorn worker on import)
+threading.Thread(target=_preload_converters, daemon=True).start()
+
+
+class ScratchDir:
+    """
+    Per-request temp directory, removed when the with-block exits
+
+    A directory that must outlive the request (streamed download, async job) is
+    passed on with hand_off(); from then on its new owner removes it.
+    """
+
+    def __init__(self):
+        self.path = tempfile.mkdtemp()
+        self.owned = True
 
-def create_temp_dir():
-    """Create a temp directory and track it for cleanup"""
-    temp_dir = tempfile.mkdtemp()
-    with _cleanup_lock:
-        _temp_dirs_to_cleanup.add(temp_dir)
-    return temp_dir
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.owned:
+            shutil.rmtree(self.path, ignore_errors=True)
+        return False
+
+    def hand_off(self):
+        """Release ownership of the directory and track it for cleanup at exit"""
+        self.owned = False
+        _temp_dirs_to_cleanup.add(self.path)
+        return self.path
 
 
 def cleanup_single_temp_dir(temp_dir):
     """Clean up a single temp directory after use"""
     try:
-        with _cleanup_lock:
-            _temp_dirs_to_cleanup.discard(temp_dir)
+        _temp_dirs_to_cleanup.discard(temp_dir)
         if os.path.exists(temp_dir):
             shutil.rmtree(temp_dir, ignore_errors=True)
     except Exception:
         pass
 
 
-def rate_limit(f):
-    """Rate limiting decorator"""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        client_ip = request.remote_addr or 'unknown'
-        current_time = time.time()
-        window = app.config['RATE_LIMIT_WINDOW']
-        max_requests = app.config['RATE_LIMIT_REQUESTS']
-
-        with _rate_limit_lock:
-            # Clean up old entries
-            if client_ip in _rate_limit_store:
-                _rate_limit_store[client_ip] = [
-                    t for t in _rate_limit_store[client_ip]
-                    if current_time - t < window
-                ]
-            else:
-                _rate_limit_store[client_ip] = []
+class TempOutputFile(io.FileIO):
+    """Converted output file that removes its temp directory when closed"""
 
-            # Check rate limit
-            if len(_rate_limit_store[client_ip]) >= max_requests:
-                return jsonify({'error': 'Too many requests. Please try again later.'}), 429
+    def __init__(self, path, temp_dir):
+        super().__init__(path, 'rb')
+        self.temp_dir = temp_dir
 
-            # Record this request
-            _rate_limit_store[client_ip].append(current_time)
+    def close(self):
+        super().close()
+        cleanup_single_temp_dir(self.temp_dir)
 
-        return f(*args, **kwargs)
-    return decorated_function
 
+def purge_accel_redirect_files():
+    """Remove handed-off downloads older than X_ACCEL_REDIRECT_RETENTION"""
+    cutoff = time.time() - app.config['X_ACCEL_REDIRECT_RETENTION']
+    with os.scandir(app.config['X_ACCEL_REDIRECT_DIR']) as entries:
+        for entry in entries:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
 
-def validate_file_content(file_obj, expected_type):
-    """
-    Validate file content by checking magic bytes
 
-    Args:
-        file_obj: File object to validate
-        expected_type: Expected file type ('docx', 'pdf', 'zip')
+def accel_redirect_response(output_path, download_name, mimetype, temp_dir):
+    """
+    Hand a converted file to nginx via X-Accel-Redirect
 
-    Returns:
-        bool: True if valid, False otherwise
+    The file is moved into X_ACCEL_REDIRECT_DIR (an nginx internal location) so
+    nginx can send it with sendfile(2) after this request's temp dir is gone.
     """
-    if expected_type not in FILE_SIGNATURES:
-        # For markdown/text files, we don't check magic bytes
-        return True
+    purge_accel_redirect_files()
 
-    # Read first few bytes
-    file_obj.seek(0)
-    header = file_obj.read(8)
-    file_obj.seek(0)
+    token = uuid.uuid4().hex
+    handoff_dir = os.path.join(app.config['X_ACCEL_REDIRECT_DIR'], token)
+    os.makedirs(handoff_dir)
+    shutil.move(output_path, os.path.join(handoff_dir, download_name))
+    cleanup_single_temp_dir(temp_dir)
 
-    signatures = FILE_SIGNATURES[expected_type]
-    for sig in signatures:
-        if header.startswith(sig):
-            return True
+    response = Response(mimetype=mimetype)
+    response.headers['X-Accel-Redirect'] = f"{app.config['X_ACCEL_REDIRECT_PREFIX']}{token}/{quote(download_name)}"
+    response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    return response
 
-    return False
 
+def send_output_file(output_path, download_name, mimetype, temp_dir):
+    """
+    Send a converted file from disk, removing its temp directory once the response is closed
 
-def is_safe_zip_entry(zip_entry_name, extract_to):
+    Response.call_on_close does not fire for send_file's passthrough responses, so
+    cleanup is tied to the file object that the WSGI server closes after sending.
+    The file is handed over unbuffered so servers providing wsgi.file_wrapper
+    (gunicorn, uWSGI) can send it with sendfile(2).
     """
-    Check if a ZIP entry is safe to extract (no path traversal)
+    if app.config['X_ACCEL_REDIRECT_DIR']:
+        return accel_redirect_response(output_path, download_name, mimetype, temp_dir)
 
-    Args:
-        zip_entry_name: Name of the entry in the ZIP file
-        extract_to: Base directory for extraction
+    output_file = TempOutputFile(output_path, temp_dir)
+    response = send_file(
+        output_file,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype=mimetype
+    )
+    response.content_length = os.fstat(output_file.fileno()).st_size
+    return response
 
-    Returns:
-        bool: True if safe, False if path traversal detected
+
+def rate_limit(f):
     """
-    # Normalize the path
-    extract_to = os.path.abspath(extract_to)
+    Rate limiting decorator (token bucket per client IP)
+
+    Each client may burst up to RATE_LIMIT_REQUESTS requests; tokens refill
+    continuously at RATE_LIMIT_REQUESTS per RATE_LIMIT_WINDOW seconds.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        client_ip = request.remote_addr or 'unknown'
+        now = time.monotonic()
+        capacity = app.config['RATE_LIMIT_REQUESTS']
+        refill_rate = capacity / app.config['RATE_LIMIT_WINDOW']
+
+        store, lock = _rate_limit_shards[hash(client_ip) & (_RATE_LIMIT_SHARDS - 1)]
+        with lock:
+            bucket = store.get(client_ip)
+            if bucket is None:
+                bucket = store[client_ip] = [capacity, now]
+
+            # Refill for the time since the last request, then spend one token
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return jsonify({'error': 'Too many requests. Please try again later.'}), 429
+            bucket[0] = tokens - 1
+
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def evict_idle_rate_limits():
+    """Periodically drop rate limit buckets for clients that have gone quiet"""
+    while True:
+        time.sleep(app.config['RATE_LIMIT_EVICT_INTERVAL'])
+        cutoff = time.monotonic() - app.config['RATE_LIMIT_IDLE_TIMEOUT']
+        for store, lock in _rate_limit_shards:
+            with lock:
+                idle = [ip for ip, (_, last_seen) in store.items() if last_seen < cutoff]
+                for ip in idle:
+                    del store[ip]
 
-    # Get the target path
-    target_path = os.path.abspath(os.path.join(extract_to, zip_entry_name))
 
-    # Check if target is within extract directory
-    return target_path.startswith(extract_to + os.sep) or target_path == extract_to
+threading.Thread(target=evict_idle_rate_limits, daemon=True).start()
 
 
-def check_zip_bomb(zip_file, max_ratio=None):
+def is_safe_zip_entry(zip_entry_name, base_with_sep):
     """
-    Check for ZIP bomb by comparing compressed vs uncompressed size
+    Check if a ZIP entry is safe to extract (no path traversal)
 
     Args:
-        zip_file: ZipFile object
-        max_ratio: Maximum allowed compression ratio
+        zip_entry_name: Name of the entry in the ZIP file
+        base_with_sep: Absolute extraction directory with a trailing separator,
+            computed once per archive
 
     Returns:
-        bool: True if safe, False if potential ZIP bomb
+        bool: True if safe, False if path traversal detected
     """
-    if max_ratio is None:
-        max_ratio = app.config['MAX_ZIP_RATIO']
-
-    total_compressed = 0
-    total_uncompressed = 0
+    # Absolute names would replace the base directory entirely
+    if zip_entry_name.startswith('/'):
+        return False
 
-    for info in zip_file.infolist():
-        total_compressed += info.compress_size
-        total_uncompressed += info.file_size
-
-    if total_compressed == 0:
+    # A relative name without '..' cannot leave the base directory
+    if '..' not in zip_entry_name:
         return True
 
-    ratio = total_uncompressed / total_compressed
-    return ratio <= max_ratio
+    # Get the target path and check it is within the extract directory
+    target_path = os.path.normpath(os.path.join(base_with_sep, zip_entry_name))
+    return target_path.startswith(base_with_sep) or target_path + os.sep == base_with_sep
 
 
 def sanitize_error_message(error):
@@ -261,21 +459,13 @@ def sanitize_error_message(error):
     Returns:
         str: Safe error message
     """
-    error_str = str(error).lower()
+    error_msg = str(error)
 
     # Check for sensitive information patterns
-    sensitive_patterns = [
-        'traceback', 'file "/', 'line ', 'in <module>',
-        '/home/', '/users/', 'c:\\', 'd:\\', 'password',
-        'secret', 'key', 'token', 'credential'
-    ]
-
-    for pattern in sensitive_patterns:
-        if pattern in error_str:
-            return 'An error occurred during conversion. Please try again.'
+    if SENSITIVE_ERROR_PATTERN.search(error_msg):
+        return 'An error occurred during conversion. Please try again.'
 
     # Limit error message length
-    error_msg = str(error)
     if len(error_msg) > 200:
         error_msg = error_msg[:200] + '...'
 
@@ -284,170 +474,102 @@ def sanitize_error_message(error):
 
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
 
-def is_convertible_file(filename):
-    """Check if the file can be converted (not a zip)"""
-    ext = get_file_extension(filename)
-    return ext in MARKDOWN_EXTENSIONS or ext in DOCX_EXTENSIONS or ext in PDF_EXTENSIONS or ext in TEX_EXTENSIONS
 
+def save_upload(file, path, expected_type=None):
+    """
+    Stream an uploaded file to disk with a fixed-size buffer
 
-def get_file_extension(filename):
-    """Get the lowercase file extension"""
-    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    Args:
+        file: Uploaded file, positioned at its start
+        path: Destination path
+        expected_type: File type whose magic bytes the upload must start with ('docx',
+            'pdf', 'zip'); checked on the first read, before anything is written
 
+    Returns:
+        bool: True if saved, False if the content doesn't match expected_type
+    """
+    header = b''
+    if expected_type in FILE_SIGNATURES:
+        header = file.stream.read(8)
+        if not header.startswith(FILE_SIGNATURES[expected_type]):
+            return False
 
-def is_markdown_file(filename):
-    """Check if the file is a markdown file"""
-    return get_file_extension(filename) in MARKDOWN_EXTENSIONS
+    with open(path, 'wb') as dst:
+        dst.write(header)
+        shutil.copyfileobj(file.stream, dst, 1024 * 1024)
+    return True
 
 
-def is_docx_file(filename):
-    """Check if the file is a Word document"""
-    return get_file_extension(filename) in DOCX_EXTENSIONS
+def get_file_extension(filename):
+    """Get the lowercase file extension"""
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
 
 
-def is_pdf_file(filename):
-    """Check if the file is a PDF document"""
-    return get_file_extension(filename) in PDF_EXTENSIONS
+def classify(filename):
+    """
+    Classify a file by its extension
 
+    Args:
+        filename: Name of the file
 
-def is_tex_file(filename):
-    """Check if the file is a LaTeX document"""
-    return get_file_extension(filename) in TEX_EXTENSIONS
+    Returns:
+        str: Source format ('md', 'docx', 'pdf', 'tex', 'zip') or None if unsupported
+    """
+    dot = filename.rfind('.')
+    if dot < 0:
+        return None
+    return EXTENSION_FORMATS.get(filename[dot + 1:].lower())
 
 
-def is_zip_file(filename):
-    """Check if the file is a zip archive"""
-    return get_file_extension(filename) in ZIP_EXTENSIONS
+def resolve_target_format(source_format, target_format):
+    """Get the requested target format, falling back to the default for unsupported targets"""
+    if (source_format, target_format) in CONVERSIONS:
+        return target_format
+    return DEFAULT_TARGET_FORMATS[source_format]
 
 
-def get_converter_and_output(input_path, filename, output_dir, target_format=None):
+def get_converter_and_output(input_path, filename, output_dir, target_format=None, content=None, output_stem=None):
     """
     Get the appropriate converter and output path for a file
 
     Args:
         input_path: Path to input file
         filename: Original filename
-        output_dir: Base output directory
+        output_dir: Base output directory; its MD/, DOCX/, PDF/, TEX/ subdirs must already exist
         target_format: Target format ('pdf', 'docx', 'md', 'tex') or None for default
+        content: Markdown text already in memory (MD -> DOCX only), used instead of input_path
+        output_stem: Output file name without extension, or None to use the input's stem
 
     Returns:
         Tuple of (converter, output_path, direction) or raises ValueError
     """
-    if is_markdown_file(filename):
-        if target_format == 'pdf':
-            if not _load_pdf_converters():
-                raise ValueError('PDF conversion not available. GTK+ libraries required on Windows.')
-            output_subdir = os.path.join(output_dir, 'PDF')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.pdf'
-            output_path = os.path.join(output_subdir, output_filename)
-            return MarkdownToPdfConverter(input_path, output_path), output_path, 'md_to_pdf'
-        elif target_format == 'tex':
-            if not _load_tex_converters():
-                raise ValueError('LaTeX conversion not available.')
-            output_subdir = os.path.join(output_dir, 'TEX')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.tex'
-            output_path = os.path.join(output_subdir, output_filename)
-            return MarkdownToTexConverter(input_path, output_path), output_path, 'md_to_tex'
-        else:
-            output_subdir = os.path.join(output_dir, 'DOCX')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.docx'
-            output_path = os.path.join(output_subdir, output_filename)
-            return MarkdownToDocxConverter(input_path, output_path), output_path, 'md_to_docx'
-
-    elif is_docx_file(filename):
-        if target_format == 'pdf':
-            if not _load_pdf_converters():
-                raise ValueError('PDF conversion not available. GTK+ libraries required on Windows.')
-            output_subdir = os.path.join(output_dir, 'PDF')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.pdf'
-            output_path = os.path.join(output_subdir, output_filename)
-            return DocxToPdfConverter(input_path, output_path), output_path, 'docx_to_pdf'
-        elif target_format == 'tex':
-            if not _load_tex_converters():
-                raise ValueError('LaTeX conversion not available.')
-            output_subdir = os.path.join(output_dir, 'TEX')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.tex'
-            output_path = os.path.join(output_subdir, output_filename)
-            return DocxToTexConverter(input_path, output_path), output_path, 'docx_to_tex'
-        else:
-            output_subdir = os.path.join(output_dir, 'MD')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.md'
-            output_path = os.path.join(output_subdir, output_filename)
-            return DocxToMarkdownConverter(input_path, output_path), output_path, 'docx_to_md'
-
-    elif is_pdf_file(filename):
-        if not _load_pdf_converters():
-            raise ValueError('PDF conversion not available. GTK+ libraries required on Windows.')
-        if target_format == 'docx':
-            output_subdir = os.path.join(output_dir, 'DOCX')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.docx'
-            output_path = os.path.join(output_subdir, output_filename)
-            return PdfToDocxConverter(input_path, output_path), output_path, 'pdf_to_docx'
-        elif target_format == 'tex':
-            if not _load_tex_converters():
-                raise ValueError('LaTeX conversion not available.')
-            output_subdir = os.path.join(output_dir, 'TEX')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.tex'
-            output_path = os.path.join(output_subdir, output_filename)
-            return PdfToTexConverter(input_path, output_path), output_path, 'pdf_to_tex'
-        else:
-            output_subdir = os.path.join(output_dir, 'MD')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.md'
-            output_path = os.path.join(output_subdir, output_filename)
-            return PdfToMarkdownConverter(input_path, output_path), output_path, 'pdf_to_md'
-
-    elif is_tex_file(filename):
-        if not _load_tex_converters():
-            raise ValueError('LaTeX conversion not available.')
-        if target_format == 'docx':
-            output_subdir = os.path.join(output_dir, 'DOCX')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.docx'
-            output_path = os.path.join(output_subdir, output_filename)
-            return TexToDocxConverter(input_path, output_path), output_path, 'tex_to_docx'
-        else:
-            # Default: TEX to MD
-            output_subdir = os.path.join(output_dir, 'MD')
-            os.makedirs(output_subdir, exist_ok=True)
-            output_filename = Path(filename).stem + '.md'
-            output_path = os.path.join(output_subdir, output_filename)
-            return TexToMarkdownConverter(input_path, output_path), output_path, 'tex_to_md'
-
-    else:
+    source_format = classify(filename)
+    if source_format not in CONVERTIBLE_FORMATS:
         raise ValueError(f'Unsupported file type: {filename}')
 
+    target_format = resolve_target_format(source_format, target_format)
 
-def get_mimetype_for_direction(direction):
-    """Get MIME type for output based on conversion direction"""
-    mimetypes = {
-        'md_to_docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'md_to_pdf': 'application/pdf',
-        'md_to_tex': 'application/x-tex',
-        'docx_to_md': 'text/markdown',
-        'docx_to_pdf': 'application/pdf',
-        'docx_to_tex': 'application/x-tex',
-        'pdf_to_md': 'text/markdown',
-        'pdf_to_docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'pdf_to_tex': 'application/x-tex',
-        'tex_to_md': 'text/markdown',
-        'tex_to_docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-    }
-    return mimetypes.get(direction, 'application/octet-stream')
+    # Flags skip the loader call once the converters are in; failed imports are retried
+    if 'pdf' in (source_format, target_format) and not (_PDF_OK or _load_pdf_converters()):
+        raise ValueError('PDF conversion not available. GTK+ libraries required on Windows.')
+    if 'tex' in (source_format, target_format) and not (_TEX_OK or _load_tex_converters()):
+        raise ValueError('LaTeX conversion not available.')
 
+    converter_name, subdir, extension, direction = CONVERSIONS[(source_format, target_format)]
+    if output_stem is None:
+        output_stem = Path(filename).stem
+    output_path = os.path.join(output_dir, subdir, output_stem + extension)
 
-def convert_single_file(input_path, output_dir, target_format=None):
+    # Converter classes are looked up at call time since PDF/LaTeX ones load lazily
+    converter_class = _converter_classes[converter_name]
+    if content is not None:
+        return converter_class(input_path, output_path, content=content), output_path, direction
+    return converter_class(input_path, output_path), output_path, direction
+
+
+def convert_single_file(input_path, output_dir, target_format=None, output_stem=None):
     """
     Convert a single file and return the output path and metadata
 
@@ -455,6 +577,7 @@ def convert_single_file(input_path, output_dir, target_format=None):
         input_path: Path to input file
         output_dir: Directory to save output (with MD/, DOCX/, PDF/ subdirs)
         target_format: Target format ('pdf', 'docx', 'md') or None for default
+        output_stem: Output file name without extension, or None to use the input's stem
 
     Returns:
         Tuple of (output_path, direction) or (None, error_message)
@@ -463,7 +586,7 @@ def convert_single_file(input_path, output_dir, target_format=None):
 
     try:
         converter, output_path, direction = get_converter_and_output(
-            input_path, filename, output_dir, target_format
+            input_path, filename, output_dir, target_format, output_stem=output_stem
         )
         converter.convert()
         return output_path, direction
@@ -473,29 +596,85 @@ def convert_single_file(input_path, output_dir, target_format=None):
         return None, str(e)
 
 
-def create_output_zip(output_dir, include_root=False):
+class ZipStreamBuffer(io.RawIOBase):
+    """Non-seekable write buffer that zipfile writes into and the response drains"""
+
+    def __init__(self):
+        super().__init__()
+        # Pieces are kept as written and joined once per drain, so the buffer
+        # never grows by reallocation the way a BytesIO does
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        """Return everything written so far and clear the buffer"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def get_output_zip_entries(output_dir, results):
     """
-    Create a zip file from the output directory
+    Map converted files to their paths inside the output zip
 
     Args:
-        output_dir: Directory containing MD/ and DOCX/ folders
-        include_root: Whether to include root folder in zip paths
+        output_dir: Directory containing MD/, DOCX/, PDF/ and TEX/ folders
+        results: Results dict from convert_batch_files
 
     Returns:
-        BytesIO object containing the zip file
+        dict: Archive name -> path of the converted file
     """
-    zip_buffer = io.BytesIO()
+    entries = {}
+    for converted in results['converted']:
+        subdir = DIRECTION_SUBDIRS[converted['direction']]
+        entries[f"{subdir}/{converted['output']}"] = os.path.join(output_dir, subdir, converted['output'])
+    return entries
+
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for root, dirs, files in os.walk(output_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                # Calculate archive path (relative to output_dir)
-                arcname = os.path.relpath(file_path, output_dir)
+def iter_output_zip(entries, chunk_size=1024 * 1024):
+    """
+    Stream a zip file of converted files chunk by chunk
+
+    Args:
+        entries: Dict of archive name -> file path (see get_output_zip_entries)
+        chunk_size: Number of bytes read from each file per chunk
+
+    Yields:
+        bytes: Successive pieces of the zip file
+    """
+    stream = ZipStreamBuffer()
+
+    # Level 1 deflate: several times faster than the default and barely larger for text
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for arcname, file_path in entries.items():
+            if get_file_extension(arcname) not in PRECOMPRESSED_EXTENSIONS:
+                # Text outputs are small; deflate them in one go with the archive settings
                 zf.write(file_path, arcname)
+                yield stream.drain()
+                continue
+
+            # Binary outputs are stored as-is and streamed chunk by chunk
+            zip_info = zipfile.ZipInfo.from_file(file_path, arcname)
+            zip_info.compress_type = zipfile.ZIP_STORED
 
-    zip_buffer.seek(0)
-    return zip_buffer
+            with open(file_path, 'rb') as src, zf.open(zip_info, 'w') as dst:
+                while True:
+                    chunk = src.read(chunk_size)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    yield stream.drain()
+
+            yield stream.drain()
+
+    # Central directory is written when the archive is closed
+    yield stream.drain()
 
 
 @app.route('/')
@@ -513,7 +692,6 @@ def convert_file():
     Query Parameters:
         format: Target format ('pdf', 'docx', 'md') - optional
     """
-    temp_dir = None
     try:
         # Check if file was uploaded
         if 'file' not in request.files:
@@ -537,11 +715,7 @@ def convert_file():
         if file_size > app.config['MAX_SINGLE_FILE_SIZE']:
             return jsonify({'error': 'File too large. Maximum size is 16MB for single files.'}), 413
 
-        # Validate file content (magic bytes) for binary files
-        ext = get_file_extension(file.filename)
-        if ext in ('docx', 'pdf'):
-            if not validate_file_content(file, ext):
-                return jsonify({'error': 'Invalid file content. The file may be corrupted or not a valid format.'}), 400
+        file_format = classify(file.filename)
 
         # Get target format from query parameter
         target_format = request.args.get('format', None)
@@ -551,294 +725,551 @@ def convert_file():
         if not filename:
             return jsonify({'error': 'Invalid filename'}), 400
 
-        # Create temporary directory (tracked for cleanup)
-        temp_dir = create_temp_dir()
-        input_path = os.path.join(temp_dir, filename)
+        # Temporary directory is removed on any early return or error
+        with ScratchDir() as scratch:
+            temp_dir = scratch.path
+            input_path = os.path.join(temp_dir, filename)
+
+            # Markdown -> DOCX converts straight from the upload; everything else reads from disk
+            content = None
+            if file_format == 'md' and resolve_target_format('md', target_format) == 'docx':
+                # Normalize newlines the way text-mode open() would
+                content = file.stream.read().decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            elif not save_upload(file, input_path, file_format):
+                # Magic bytes are checked for binary files as the upload is saved
+                return jsonify({'error': 'Invalid file content. The file may be corrupted or not a valid format.'}), 400
 
-        # Save uploaded file
-        file.save(input_path)
+            # Get converter and output info
+            try:
+                converter, output_path, direction = get_converter_and_output(
+                    input_path, filename, temp_dir, target_format, content
+                )
+            except ValueError as e:
+                return jsonify({'error': sanitize_error_message(e)}), 400
 
-        # Get converter and output info
-        try:
-            converter, output_path, direction = get_converter_and_output(
-                input_path, filename, temp_dir, target_format
-            )
-        except ValueError as e:
-            return jsonify({'error': sanitize_error_message(e)}), 400
+            # Convert (only this request's one output subfolder is needed)
+            os.makedirs(os.path.dirname(output_path))
+            converter.convert()
 
-        # Convert
-        converter.convert()
+            # Get output filename and mimetype
+            output_filename = os.path.basename(output_path)
+            mimetype = DIRECTION_MIMETYPES.get(direction, 'application/octet-stream')
 
-        # Get output filename and mimetype
-        output_filename = os.path.basename(output_path)
-        mimetype = get_mimetype_for_direction(direction)
-
-        # Read file into memory before cleanup
-        with open(output_path, 'rb') as f:
-            output_data = io.BytesIO(f.read())
-        output_data.seek(0)
-
-        # Clean up temp directory
-        cleanup_single_temp_dir(temp_dir)
-        temp_dir = None
-
-        # Send the converted file
-        return send_file(
-            output_data,
-            as_attachment=True,
-            download_name=output_filename,
-            mimetype=mimetype
-        )
+            # Send the converted file (temp directory is removed once it has been sent)
+            return send_output_file(output_path, output_filename, mimetype, scratch.hand_off())
 
     except Exception as e:
-        if temp_dir:
-            cleanup_single_temp_dir(temp_dir)
         return jsonify({'error': f'Conversion failed: {sanitize_error_message(e)}'}), 500
 
 
-@app.route('/convert-batch', methods=['POST'])
-@rate_limit
-def convert_batch():
+def extract_zip_members(zip_path, members, extract_to):
     """
-    Handle batch file conversion (multiple files or zip)
+    Extract zip members in parallel, each worker reading through its own ZipFile handle
 
-    Accepts:
-        - Multiple files via 'files' field
-        - Single zip file via 'file' field
-
-    Returns:
-        - Zip file containing converted files organized in MD/ and DOCX/ folders
+    Args:
+        zip_path: Path to the zip file
+        members: ZipInfo entries to extract (filename is used as the target name)
+        extract_to: Directory to extract into
     """
-    temp_dir = None
+    if not members:
+        return
+
+    # ZipFile shares one file position between readers, so give each thread its own
+    local = threading.local()
+    handles = []
+
+    def extract(member):
+        zf = getattr(local, 'zf', None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(zip_path, 'r')
+            handles.append(zf)
+        with zf.open(member) as src, open(os.path.join(extract_to, member.filename), 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+
     try:
-        temp_dir = create_temp_dir()
-        input_dir = os.path.join(temp_dir, 'input')
-        output_dir = os.path.join(temp_dir, 'output')
-        os.makedirs(input_dir, exist_ok=True)
-        os.makedirs(output_dir, exist_ok=True)
-
-        files_to_convert = []
-        results = {'converted': [], 'errors': [], 'skipped': []}
-        seen_filenames = set()  # Track filenames to prevent overwrites
-
-        # Check for multiple files
-        if 'files' in request.files:
-            files = request.files.getlist('files')
-            for file in files:
-                if file.filename == '':
-                    continue
+        max_workers = min(app.config['MAX_EXTRACT_WORKERS'], len(members))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(extract, members))
+    finally:
+        for zf in handles:
+            zf.close()
 
-                # Check individual file size
-                file.seek(0, 2)
-                file_size = file.tell()
-                file.seek(0)
 
-                if file_size > app.config['MAX_SINGLE_FILE_SIZE']:
-                    results['errors'].append({
-                        'file': file.filename,
-                        'error': 'File too large (max 16MB per file)'
-                    })
-                    continue
+def collect_batch_files(temp_dir, input_dir, results):
+    """
+    Save the uploaded batch files (or extract the uploaded zip) into the input directory
 
-                filename = secure_filename(file.filename)
-                if not filename:
-                    continue
+    Args:
+        temp_dir: Request temp directory (holds the uploaded zip)
+        input_dir: Directory to save convertible files to
+        results: Results dict; rejected and skipped files are recorded here
 
-                # Handle duplicate filenames
-                if filename in seen_filenames:
-                    base, ext = os.path.splitext(filename)
-                    counter = 1
-                    while f"{base}_{counter}{ext}" in seen_filenames:
-                        counter += 1
-                    filename = f"{base}_{counter}{ext}"
-
-                seen_filenames.add(filename)
-
-                if is_convertible_file(filename):
-                    # Validate file content for binary files
-                    ext = get_file_extension(filename)
-                    if ext in ('docx', 'pdf') and not validate_file_content(file, ext):
-                        results['errors'].append({
-                            'file': filename,
-                            'error': 'Invalid file content'
-                        })
-                        continue
-
-                    file_path = os.path.join(input_dir, filename)
-                    file.save(file_path)
-                    files_to_convert.append(file_path)
-                else:
-                    results['skipped'].append(filename)
-
-        # Check for single zip file
-        elif 'file' in request.files:
-            file = request.files['file']
+    Returns:
+        Tuple of (files_to_convert, None) or (None, error_message)
+    """
+    # Limits are read once per request rather than once per file or zip entry
+    max_file_size = app.config['MAX_SINGLE_FILE_SIZE']
+    max_extracted_size = app.config['MAX_ZIP_EXTRACTED_SIZE']
+
+    files_to_convert = []
+    seen_filenames = set()  # Track filenames to prevent overwrites
+    next_suffix = {}  # Filename -> next counter to try, so repeats don't rescan from 1
+
+    def unique_name(name):
+        """Rename duplicates to name_1.ext, name_2.ext, ..."""
+        if name in seen_filenames:
+            base, ext = os.path.splitext(name)
+            counter = next_suffix.get(name, 1)
+            while f"{base}_{counter}{ext}" in seen_filenames:
+                counter += 1
+            next_suffix[name] = counter + 1
+            name = f"{base}_{counter}{ext}"
+        seen_filenames.add(name)
+        return name
+
+    # Check for multiple files
+    if 'files' in request.files:
+        files = request.files.getlist('files')
+        for file in files:
             if file.filename == '':
-                return jsonify({'error': 'No file selected'}), 400
+                continue
+
+            # Check individual file size
+            file.seek(0, 2)
+            file_size = file.tell()
+            file.seek(0)
+
+            if file_size > max_file_size:
+                results['errors'].append({
+                    'file': file.filename,
+                    'error': 'File too large (max 16MB per file)'
+                })
+                continue
 
             filename = secure_filename(file.filename)
             if not filename:
-                return jsonify({'error': 'Invalid filename'}), 400
-
-            if is_zip_file(filename):
-                # Validate ZIP file content
-                if not validate_file_content(file, 'zip'):
-                    return jsonify({'error': 'Invalid ZIP file'}), 400
-
-                # Extract zip file
-                zip_path = os.path.join(temp_dir, filename)
-                file.save(zip_path)
-
-                try:
-                    with zipfile.ZipFile(zip_path, 'r') as zf:
-                        # Check for ZIP bomb
-                        if not check_zip_bomb(zf):
-                            return jsonify({'error': 'ZIP file rejected: suspicious compression ratio'}), 400
-
-                        for zip_info in zf.infolist():
-                            if zip_info.is_dir():
-                                continue
-
-                            # Check for path traversal
-                            if not is_safe_zip_entry(zip_info.filename, input_dir):
-                                results['errors'].append({
-                                    'file': zip_info.filename,
-                                    'error': 'Invalid path in ZIP'
-                                })
-                                continue
-
-                            # Check individual file size within ZIP
-                            if zip_info.file_size > app.config['MAX_SINGLE_FILE_SIZE']:
-                                results['errors'].append({
-                                    'file': zip_info.filename,
-                                    'error': 'File too large (max 16MB per file)'
-                                })
-                                continue
-
-                            # Get just the filename (ignore folder structure)
-                            extracted_name = os.path.basename(zip_info.filename)
-                            if not extracted_name:
-                                continue
-                            extracted_name = secure_filename(extracted_name)
-                            if not extracted_name:
-                                continue
-
-                            # Handle duplicate filenames
-                            if extracted_name in seen_filenames:
-                                base, ext = os.path.splitext(extracted_name)
-                                counter = 1
-                                while f"{base}_{counter}{ext}" in seen_filenames:
-                                    counter += 1
-                                extracted_name = f"{base}_{counter}{ext}"
-
-                            seen_filenames.add(extracted_name)
-
-                            if is_convertible_file(extracted_name):
-                                # Extract to input dir (safely read in chunks)
-                                extracted_path = os.path.join(input_dir, extracted_name)
-                                with zf.open(zip_info) as src:
-                                    with open(extracted_path, 'wb') as dst:
-                                        # Read in 64KB chunks to avoid memory issues
-                                        chunk_size = 65536
-                                        bytes_read = 0
-                                        while True:
-                                            chunk = src.read(chunk_size)
-                                            if not chunk:
-                                                break
-                                            dst.write(chunk)
-                                            bytes_read += len(chunk)
-                                            # Safety check
-                                            if bytes_read > app.config['MAX_SINGLE_FILE_SIZE']:
-                                                break
-                                files_to_convert.append(extracted_path)
-                            elif extracted_name:
-                                results['skipped'].append(extracted_name)
-                except zipfile.BadZipFile:
-                    return jsonify({'error': 'Invalid or corrupted ZIP file'}), 400
-            elif is_convertible_file(filename):
-                # Single convertible file - redirect to single convert
+                continue
+
+            # Handle duplicate filenames
+            filename = unique_name(filename)
+
+            file_format = classify(filename)
+            if file_format in CONVERTIBLE_FORMATS:
+                # Binary files are checked for their magic bytes as they are saved
                 file_path = os.path.join(input_dir, filename)
-                file.save(file_path)
+                if not save_upload(file, file_path, file_format):
+                    results['errors'].append({
+                        'file': filename,
+                        'error': 'Invalid file content'
+                    })
+                    continue
                 files_to_convert.append(file_path)
             else:
-                return jsonify({'error': f'Unsupported file type'}), 400
+                results['skipped'].append(filename)
+
+    # Check for single zip file
+    elif 'file' in request.files:
+        file = request.files['file']
+        if file.filename == '':
+            return None, 'No file selected'
+
+        filename = secure_filename(file.filename)
+        if not filename:
+            return None, 'Invalid filename'
+
+        file_format = classify(filename)
+        if file_format == 'zip':
+            # Save the zip, validating its magic bytes on the way
+            zip_path = os.path.join(temp_dir, filename)
+            if not save_upload(file, zip_path, 'zip'):
+                return None, 'Invalid ZIP file'
+
+            try:
+                with zipfile.ZipFile(zip_path, 'r') as zf:
+                    # ZIP bomb check runs in the same pass as the per-entry checks.
+                    # Compressed data can't exceed the archive, so a running uncompressed
+                    # total above max_ratio * archive size already proves the ratio is too high.
+                    max_ratio = app.config['MAX_ZIP_RATIO']
+                    max_uncompressed = max_ratio * os.path.getsize(zip_path)
+                    total_compressed = 0
+                    total_uncompressed = 0
+
+                    members_to_extract = []
+                    extracted_size = 0
+                    extract_base = os.path.abspath(input_dir) + os.sep
+                    for zip_info in zf.infolist():
+                        total_compressed += zip_info.compress_size
+                        total_uncompressed += zip_info.file_size
+                        if total_uncompressed > max_uncompressed:
+                            return None, 'ZIP file rejected: suspicious compression ratio'
+
+                        if zip_info.is_dir():
+                            continue
+
+                        # Check for path traversal
+                        if not is_safe_zip_entry(zip_info.filename, extract_base):
+                            results['errors'].append({
+                                'file': zip_info.filename,
+                                'error': 'Invalid path in ZIP'
+                            })
+                            continue
+
+                        # Check individual file size within ZIP
+                        if zip_info.file_size > max_file_size:
+                            results['errors'].append({
+                                'file': zip_info.filename,
+                                'error': 'File too large (max 16MB per file)'
+                            })
+                            continue
+
+                        # Get just the filename (ignore folder structure)
+                        extracted_name = os.path.basename(zip_info.filename)
+                        if not extracted_name:
+                            continue
+                        extracted_name = secure_filename(extracted_name)
+                        if not extracted_name:
+                            continue
+
+                        # Handle duplicate filenames
+                        extracted_name = unique_name(extracted_name)
+
+                        if classify(extracted_name) in CONVERTIBLE_FORMATS:
+                            # Enforce a total budget; zipfile never yields more than file_size
+                            extracted_size += zip_info.file_size
+                            if extracted_size > max_extracted_size:
+                                return None, 'ZIP file rejected: extracted contents too large'
+
+                            # Flatten into input dir under the secured name
+                            zip_info.filename = extracted_name
+                            members_to_extract.append(zip_info)
+                            files_to_convert.append(os.path.join(input_dir, extracted_name))
+                        elif extracted_name:
+                            results['skipped'].append(extracted_name)
+
+                    if total_compressed and total_uncompressed / total_compressed > max_ratio:
+                        return None, 'ZIP file rejected: suspicious compression ratio'
+
+                # Extract all accepted members in parallel
+                extract_zip_members(zip_path, members_to_extract, input_dir)
+            except zipfile.BadZipFile:
+                return None, 'Invalid or corrupted ZIP file'
+        elif file_format in CONVERTIBLE_FORMATS:
+            # Single convertible file - redirect to single convert
+            file_path = os.path.join(input_dir, filename)
+            save_upload(file, file_path)
+            files_to_convert.append(file_path)
         else:
-            return jsonify({'error': 'No files uploaded'}), 400
+            return None, 'Unsupported file type'
+    else:
+        return None, 'No files uploaded'
+
+    if not files_to_convert:
+        return None, 'No convertible files found'
+
+    return files_to_convert, None
+
+
+def get_process_pool():
+    """Get the shared process pool for CPU-bound conversions, or None if disabled"""
+    global _process_pool
+    if not app.config['BATCH_PROCESS_WORKERS']:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Forking this multithreaded server could copy a lock held by another thread
+            # (e.g. the converter import lock) into the child, so workers start from a
+            # fork server (or fresh interpreters where that isn't available)
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _process_pool = ProcessPoolExecutor(
+                max_workers=app.config['BATCH_PROCESS_WORKERS'],
+                mp_context=multiprocessing.get_context(start_method),
+            )
+    return _process_pool
 
-        if not files_to_convert:
-            return jsonify({'error': 'No convertible files found'}), 400
 
-        # Convert all files
-        for file_path in files_to_convert:
-            output_path, result = convert_single_file(file_path, output_dir)
-            filename = os.path.basename(file_path)
+def plan_output_stems(files_to_convert):
+    """
+    Pick an output file name for each batch input so no two share an output path
 
-            if output_path:
-                results['converted'].append({
-                    'input': filename,
-                    'output': os.path.basename(output_path),
-                    'direction': result
-                })
-            else:
-                results['errors'].append({
-                    'file': filename,
-                    'error': sanitize_error_message(result)
-                })
+    Inputs with the same stem (doc.md and doc.txt, or doc.pdf and doc.docx)
+    would otherwise convert into the same file at the same time. Later ones
+    are renamed to doc_1, doc_2, ... within their output folder.
+
+    Args:
+        files_to_convert: Paths of the files to convert
+
+    Returns:
+        list: Output stem for each file, in the same order
+    """
+    taken = set()  # (output subfolder, output file name) already assigned
+    stems = []
+    for file_path in files_to_convert:
+        stem = Path(file_path).stem
+        source_format = classify(file_path)
+        if source_format not in CONVERTIBLE_FORMATS:
+            # Rejected by the converter anyway; nothing is written
+            stems.append(stem)
+            continue
+
+        _, subdir, extension, _ = CONVERSIONS[(source_format, DEFAULT_TARGET_FORMATS[source_format])]
+        candidate = stem
+        counter = 1
+        while (subdir, candidate + extension) in taken:
+            candidate = f"{stem}_{counter}"
+            counter += 1
+        taken.add((subdir, candidate + extension))
+        stems.append(candidate)
+    return stems
+
+
+def convert_batch_files(files_to_convert, output_dir, results, on_progress=None):
+    """
+    Convert a batch of files in parallel and record the outcome of each
+
+    Args:
+        files_to_convert: Paths of the files to convert
+        output_dir: Directory to save output (with MD/, DOCX/, PDF/, TEX/ subdirs)
+        results: Results dict; converted files and errors are recorded here
+        on_progress: Optional callback called with (done, total) after each file
+    """
+    # Convert all files in parallel. PDF parsing is pure Python and holds the GIL,
+    # so PDF inputs go to the process pool; the rest run on threads.
+    total = len(files_to_convert)
+    max_workers = min(app.config['MAX_BATCH_WORKERS'], total)
+    process_pool = get_process_pool()
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for file_path, output_stem in zip(files_to_convert, plan_output_stems(files_to_convert)):
+            pool = process_pool if process_pool and classify(file_path) == 'pdf' else executor
+            future = pool.submit(convert_single_file, file_path, output_dir, None, output_stem)
+            futures[future] = file_path
+
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                outcomes[futures[future]] = future.result()
+            except Exception as e:
+                # e.g. a crashed worker process
+                outcomes[futures[future]] = (None, str(e))
+            if on_progress:
+                on_progress(done, total)
+
+    for file_path in files_to_convert:
+        output_path, result = outcomes[file_path]
+        filename = os.path.basename(file_path)
+
+        if output_path:
+            results['converted'].append({
+                'input': filename,
+                'output': os.path.basename(output_path),
+                'direction': result
+            })
+        else:
+            results['errors'].append({
+                'file': filename,
+                'error': sanitize_error_message(result)
+            })
 
-        # If only one file was converted and no errors, return the single file
-        if len(results['converted']) == 1 and not results['errors']:
-            converted = results['converted'][0]
-            direction = converted['direction']
-
-            # Determine output folder based on direction
-            if direction in ('md_to_docx', 'pdf_to_docx', 'tex_to_docx'):
-                output_folder = 'DOCX'
-            elif direction in ('md_to_pdf', 'docx_to_pdf'):
-                output_folder = 'PDF'
-            elif direction in ('md_to_tex', 'docx_to_tex', 'pdf_to_tex'):
-                output_folder = 'TEX'
-            else:
-                output_folder = 'MD'
 
-            output_path = os.path.join(output_dir, output_folder, converted['output'])
-            mimetype = get_mimetype_for_direction(direction)
+def batch_download_response(temp_dir, output_dir, results):
+    """
+    Build the download response for a finished batch and clean up its temp directory
+
+    Returns the single converted file when there is exactly one and no errors,
+    otherwise a streamed zip of the output directory.
+    """
+    # If only one file was converted and no errors, return the single file
+    if len(results['converted']) == 1 and not results['errors']:
+        converted = results['converted'][0]
+        direction = converted['direction']
+
+        output_path = os.path.join(output_dir, DIRECTION_SUBDIRS[direction], converted['output'])
+        mimetype = DIRECTION_MIMETYPES.get(direction, 'application/octet-stream')
 
-            # Read file into memory before cleanup
-            with open(output_path, 'rb') as f:
-                output_data = io.BytesIO(f.read())
-            output_data.seek(0)
+        return send_output_file(output_path, converted['output'], mimetype, temp_dir)
 
-            # Clean up temp directory
+    # Stream the zip file, cleaning up once the last chunk is sent
+    entries = get_output_zip_entries(output_dir, results)
+
+    def generate():
+        try:
+            yield from iter_output_zip(entries)
+        finally:
             cleanup_single_temp_dir(temp_dir)
-            temp_dir = None
 
-            return send_file(
-                output_data,
-                as_attachment=True,
-                download_name=converted['output'],
-                mimetype=mimetype
-            )
+    return Response(
+        generate(),
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment; filename=converted_files.zip'}
+    )
+
+
+def purge_expired_jobs():
+    """Drop finished batch jobs whose results were never downloaded"""
+    now = time.time()
+    with _jobs_lock:
+        expired = [
+            job_id for job_id, job in _jobs.items()
+            if job['finished_at'] and now - job['finished_at'] > app.config['JOB_RETENTION']
+        ]
+        for job_id in expired:
+            cleanup_single_temp_dir(_jobs.pop(job_id)['temp_dir'])
+
+
+def final_job_event(job):
+    """Build the done/failed progress event of a finished batch job"""
+    if job['status'] == 'failed':
+        return {'stage': 'failed', 'error': job['error']}
+    return {
+        'stage': 'done',
+        'pct': 100,
+        'converted': len(job['results']['converted']),
+        'errors': job['results']['errors'],
+    }
 
-        # Create and send zip file
-        zip_buffer = create_output_zip(output_dir)
 
-        # Clean up temp directory
-        cleanup_single_temp_dir(temp_dir)
-        temp_dir = None
+def run_batch_job(job_id):
+    """Convert a queued batch job in the background, publishing progress events"""
+    job = _jobs[job_id]
+    events = job['events']
 
-        return send_file(
-            zip_buffer,
-            as_attachment=True,
-            download_name='converted_files.zip',
-            mimetype='application/zip'
-        )
+    def on_progress(done, total):
+        events.put({'stage': 'converting', 'done': done, 'total': total, 'pct': done * 100 // total})
+
+    try:
+        convert_batch_files(job['files'], job['output_dir'], job['results'], on_progress)
+        job['status'] = 'done'
+    except Exception as e:
+        job['error'] = f'Batch conversion failed: {sanitize_error_message(e)}'
+        job['status'] = 'failed'
+    finally:
+        job['finished_at'] = time.time()
+    events.put(final_job_event(job))
+
+
+@app.route('/convert-batch', methods=['POST'])
+@rate_limit
+def convert_batch():
+    """
+    Handle batch file conversion (multiple files or zip)
+
+    Accepts:
+        - Multiple files via 'files' field
+        - Single zip file via 'file' field
+
+    Query Parameters:
+        async: If set, queue the batch and return job URLs instead of waiting
+
+    Returns:
+        - Zip file containing converted files organized in MD/ and DOCX/ folders
+        - With async, JSON with job_id, progress_url and download_url (202)
+    """
+    try:
+        with ScratchDir() as scratch:
+            temp_dir = scratch.path
+            input_dir = os.path.join(temp_dir, 'input')
+            output_dir = os.path.join(temp_dir, 'output')
+            os.makedirs(input_dir, exist_ok=True)
+            # Output subfolders are created once here, not per converted file
+            for subdir in OUTPUT_SUBDIRS:
+                os.makedirs(os.path.join(output_dir, subdir))
+
+            results = {'converted': [], 'errors': [], 'skipped': []}
+            files_to_convert, error = collect_batch_files(temp_dir, input_dir, results)
+            if error:
+                return jsonify({'error': error}), 400
+
+            if request.args.get('async'):
+                purge_expired_jobs()
+                job_id = uuid.uuid4().hex
+                with _jobs_lock:
+                    _jobs[job_id] = {
+                        'temp_dir': scratch.hand_off(),
+                        'output_dir': output_dir,
+                        'files': files_to_convert,
+                        'results': results,
+                        'events': queue.Queue(),
+                        'status': 'running',
+                        'finished_at': None,
+                    }
+                threading.Thread(target=run_batch_job, args=(job_id,), daemon=True).start()
+                return jsonify({
+                    'job_id': job_id,
+                    'total': len(files_to_convert),
+                    'progress_url': f'/progress/{job_id}',
+                    'download_url': f'/download/{job_id}',
+                }), 202
+
+            # A lone file needs none of the batch machinery; convert and send it directly
+            if len(files_to_convert) == 1 and not results['errors']:
+                output_path, result = convert_single_file(files_to_convert[0], output_dir)
+                if not output_path:
+                    return jsonify({'error': f'Conversion failed: {sanitize_error_message(result)}'}), 500
+
+                mimetype = DIRECTION_MIMETYPES.get(result, 'application/octet-stream')
+                return send_output_file(
+                    output_path, os.path.basename(output_path), mimetype, scratch.hand_off()
+                )
+
+            convert_batch_files(files_to_convert, output_dir, results)
+
+            return batch_download_response(scratch.hand_off(), output_dir, results)
 
     except Exception as e:
-        if temp_dir:
-            cleanup_single_temp_dir(temp_dir)
         return jsonify({'error': f'Batch conversion failed: {sanitize_error_message(e)}'}), 500
 
 
+@app.route('/progress/<job_id>')
+def batch_progress(job_id):
+    """Stream progress events for a queued batch job (Server-Sent Events)"""
+    job = _jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    def generate():
+        while True:
+            if job['status'] != 'running' and job['events'].empty():
+                # The final event went to another listener or an earlier connection
+                yield f'data: {json.dumps(final_job_event(job))}\n\n'
+                break
+            try:
+                event = job['events'].get(timeout=15)
+            except queue.Empty:
+                if job_id not in _jobs:
+                    # Downloaded or expired
+                    break
+                # Comment line keeps proxies from closing an idle stream
+                yield ': keepalive\n\n'
+                continue
+            yield f'data: {json.dumps(event)}\n\n'
+            if event['stage'] in ('done', 'failed'):
+                break
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
+@app.route('/download/<job_id>')
+def batch_download(job_id):
+    """Download the result of a finished batch job"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Unknown job'}), 404
+        if job['status'] == 'running':
+            return jsonify({'error': 'Job is still running'}), 409
+        del _jobs[job_id]
+
+    if job['status'] == 'failed':
+        cleanup_single_temp_dir(job['temp_dir'])
+        return jsonify({'error': 'Batch conversion failed'}), 500
+
+    if not job['results']['converted']:
+        cleanup_single_temp_dir(job['temp_dir'])
+        return jsonify({'error': 'No files could be converted', 'errors': job['results']['errors']}), 400
+
+    return batch_download_response(job['temp_dir'], job['output_dir'], job['results'])
+
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
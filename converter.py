@@ -8,9 +8,12 @@ Supports folder batch conversion with organized output
 
 import sys
 import argparse
+import json
 import os
+import stat
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 from md_to_docx import MarkdownToDocxConverter
 from docx_to_md import DocxToMarkdownConverter
@@ -33,6 +36,58 @@ TEX_EXTENSIONS = {'.tex', '.latex'}
 ALL_EXTENSIONS = MARKDOWN_EXTENSIONS | DOCX_EXTENSIONS | PDF_EXTENSIONS | TEX_EXTENSIONS
 ALL_EXTENSIONS_FOLDER = MARKDOWN_EXTENSIONS_FOLDER | DOCX_EXTENSIONS | PDF_EXTENSIONS | TEX_EXTENSIONS
 
+# Per-folder record of the input each output was converted from (hidden, so never scanned)
+CACHE_FILENAME = '.convcache.json'
+
+# Source extensions -> (default direction, target format -> direction overrides)
+_SOURCE_DIRECTIONS = (
+    (MARKDOWN_EXTENSIONS, 'md_to_docx', {'pdf': 'md_to_pdf', 'tex': 'md_to_tex'}),
+    (DOCX_EXTENSIONS, 'docx_to_md', {'pdf': 'docx_to_pdf', 'tex': 'docx_to_tex'}),
+    (PDF_EXTENSIONS, 'pdf_to_md', {'docx': 'pdf_to_docx', 'tex': 'pdf_to_tex'}),
+    (TEX_EXTENSIONS, 'tex_to_md', {'docx': 'tex_to_docx'}),
+)
+
+# (extension, target format or None) -> conversion direction
+DIRECTION_TABLE = {
+    (ext, target): overrides.get(target, default)
+    for extensions, default, overrides in _SOURCE_DIRECTIONS
+    for ext in extensions
+    for target in (None, 'md', 'docx', 'pdf', 'tex')
+}
+
+# Conversion direction -> converter class
+CONVERTER_CLASSES = {
+    'md_to_docx': MarkdownToDocxConverter,
+    'md_to_pdf': MarkdownToPdfConverter,
+    'md_to_tex': MarkdownToTexConverter,
+    'docx_to_md': DocxToMarkdownConverter,
+    'docx_to_pdf': DocxToPdfConverter,
+    'docx_to_tex': DocxToTexConverter,
+    'pdf_to_md': PdfToMarkdownConverter,
+    'pdf_to_docx': PdfToDocxConverter,
+    'pdf_to_tex': PdfToTexConverter,
+    'tex_to_md': TexToMarkdownConverter,
+    'tex_to_docx': TexToDocxConverter,
+}
+
+# Output directories we create; never scanned for input files
+OUTPUT_DIRS = {'MD', 'DOCX', 'PDF', 'TEX'}
+
+# Conversion direction -> (output subfolder, output extension, display label)
+DIRECTION_OUTPUTS = {
+    'md_to_docx': ('DOCX', '.docx', 'MD -> DOCX'),
+    'md_to_pdf': ('PDF', '.pdf', 'MD -> PDF'),
+    'md_to_tex': ('TEX', '.tex', 'MD -> TEX'),
+    'docx_to_md': ('MD', '.md', 'DOCX -> MD'),
+    'docx_to_pdf': ('PDF', '.pdf', 'DOCX -> PDF'),
+    'docx_to_tex': ('TEX', '.tex', 'DOCX -> TEX'),
+    'pdf_to_md': ('MD', '.md', 'PDF -> MD'),
+    'pdf_to_docx': ('DOCX', '.docx', 'PDF -> DOCX'),
+    'pdf_to_tex': ('TEX', '.tex', 'PDF -> TEX'),
+    'tex_to_md': ('MD', '.md', 'TEX -> MD'),
+    'tex_to_docx': ('DOCX', '.docx', 'TEX -> DOCX'),
+}
+
 
 def get_conversion_direction(input_file: str, target_format: Optional[str] = None) -> str:
     """
@@ -47,32 +102,25 @@ def get_conversion_direction(input_file: str, target_format: Optional[str] = Non
                 'docx_to_tex', 'pdf_to_md', 'pdf_to_docx', 'pdf_to_tex',
                 'tex_to_md', 'tex_to_docx'
     """
-    suffix = Path(input_file).suffix.lower()
-
-    if suffix in MARKDOWN_EXTENSIONS:
-        if target_format == 'pdf':
-            return 'md_to_pdf'
-        elif target_format == 'tex':
-            return 'md_to_tex'
-        return 'md_to_docx'  # Default
-    elif suffix in DOCX_EXTENSIONS:
-        if target_format == 'pdf':
-            return 'docx_to_pdf'
-        elif target_format == 'tex':
-            return 'docx_to_tex'
-        return 'docx_to_md'  # Default
-    elif suffix in PDF_EXTENSIONS:
-        if target_format == 'docx':
-            return 'pdf_to_docx'
-        elif target_format == 'tex':
-            return 'pdf_to_tex'
-        return 'pdf_to_md'  # Default
-    elif suffix in TEX_EXTENSIONS:
-        if target_format == 'docx':
-            return 'tex_to_docx'
-        return 'tex_to_md'  # Default
-    else:
+    return get_conversion_direction_from_suffix(Path(input_file).suffix.lower(), target_format)
+
+
+def get_conversion_direction_from_suffix(suffix: str, target_format: Optional[str] = None) -> str:
+    """
+    Determine conversion direction from an already lowercased extension
+
+    Args:
+        suffix: Lowercase file extension including the dot (e.g. '.md')
+        target_format: Target format ('pdf', 'docx', 'md', 'tex') or None for default
+
+    Returns:
+        Conversion direction string (see get_conversion_direction)
+    """
+    # Unrecognised target formats fall back to the default direction
+    direction = DIRECTION_TABLE.get((suffix, target_format)) or DIRECTION_TABLE.get((suffix, None))
+    if direction is None:
         raise ValueError(f"Unsupported file type: {suffix}. Use .md, .markdown, .txt, .docx, .pdf, .tex, or .latex")
+    return direction
 
 
 def is_convertible_file(file_path: Path, include_txt: bool = True) -> bool:
@@ -86,36 +134,42 @@ def is_convertible_file(file_path: Path, include_txt: bool = True) -> bool:
     return file_path.suffix.lower() in extensions
 
 
-def collect_files_from_folder(folder_path: Path, recursive: bool = False) -> List[Path]:
+def _scan_folder(dirpath: str, recursive: bool):
+    """Yield convertible file paths under dirpath, reading type info from os.scandir entries"""
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            name = entry.name
+            # Hidden entries (.git, .venv, ...) are pruned by name before any type check
+            if name.startswith('.'):
+                continue
+            if entry.is_dir():
+                # Skip output directories by name; never descend into symlinked dirs
+                if recursive and name not in OUTPUT_DIRS and not entry.is_symlink():
+                    yield from _scan_folder(entry.path, recursive)
+            elif entry.is_file():
+                dot = name.rfind('.')
+                if dot > 0:
+                    suffix = name[dot:].lower()
+                    if suffix in ALL_EXTENSIONS_FOLDER:
+                        yield Path(entry.path), suffix
+
+
+def collect_files_from_folder(folder_path: Path, recursive: bool = False) -> List[Tuple[Path, str]]:
     """
     Collect all convertible files from a folder
 
     Note: .txt files are excluded from folder scanning to avoid converting
     non-markdown text files. Use explicit file paths to convert .txt files.
+    Hidden files and directories (names starting with '.') are skipped.
 
     Args:
         folder_path: Path to the folder
         recursive: Whether to search subdirectories
 
     Returns:
-        List of file paths
+        List of (file path, lowercase extension) tuples, sorted by path
     """
-    files = []
-
-    if recursive:
-        for root, dirs, filenames in os.walk(folder_path):
-            # Skip output directories we create
-            dirs[:] = [d for d in dirs if d not in ('MD', 'DOCX', 'PDF', 'TEX')]
-            for filename in filenames:
-                file_path = Path(root) / filename
-                if is_convertible_file(file_path, include_txt=False):
-                    files.append(file_path)
-    else:
-        for item in folder_path.iterdir():
-            if item.is_file() and is_convertible_file(item, include_txt=False):
-                files.append(item)
-
-    return sorted(files)
+    return sorted(_scan_folder(str(folder_path), recursive))
 
 
 def get_converter_for_direction(direction: str, input_file: str, output_file: str = None):
@@ -130,27 +184,37 @@ def get_converter_for_direction(direction: str, input_file: str, output_file: st
     Returns:
         Converter instance
     """
-    converters = {
-        'md_to_docx': MarkdownToDocxConverter,
-        'md_to_pdf': MarkdownToPdfConverter,
-        'md_to_tex': MarkdownToTexConverter,
-        'docx_to_md': DocxToMarkdownConverter,
-        'docx_to_pdf': DocxToPdfConverter,
-        'docx_to_tex': DocxToTexConverter,
-        'pdf_to_md': PdfToMarkdownConverter,
-        'pdf_to_docx': PdfToDocxConverter,
-        'pdf_to_tex': PdfToTexConverter,
-        'tex_to_md': TexToMarkdownConverter,
-        'tex_to_docx': TexToDocxConverter,
-    }
-
-    converter_class = converters.get(direction)
+    converter_class = CONVERTER_CLASSES.get(direction)
     if not converter_class:
         raise ValueError(f"Unknown conversion direction: {direction}")
 
     return converter_class(input_file, output_file)
 
 
+def _convert_worker(direction: str, input_file: str, output_file: str) -> str:
+    """Run one conversion (module-level so it can be sent to a worker process)"""
+    return get_converter_for_direction(direction, input_file, output_file).convert()
+
+
+def _load_conversion_cache(folder_path: Path) -> Dict[str, list]:
+    """Load a folder's conversion cache: output path -> [input path, size, mtime_ns]"""
+    try:
+        with open(folder_path / CACHE_FILENAME, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_conversion_cache(folder_path: Path, cache: Dict[str, list]):
+    """Write a folder's conversion cache (best effort; e.g. read-only folders are fine)"""
+    try:
+        with open(folder_path / CACHE_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
 def convert_file(input_file: str, output_file: str = None, verbose: bool = False,
                  target_format: Optional[str] = None) -> str:
     """
@@ -171,15 +235,25 @@ def convert_file(input_file: str, output_file: str = None, verbose: bool = False
 
 
 def convert_folder(folder_path: Path, recursive: bool = False, verbose: bool = False,
-                   target_format: Optional[str] = None) -> Tuple[int, int, int]:
+                   target_format: Optional[str] = None,
+                   workers: Optional[int] = None,
+                   overwrite: bool = False) -> Tuple[int, int, int]:
     """
     Convert all files in a folder, organizing output into MD/, DOCX/, and PDF/ subfolders
 
+    Files are converted in parallel worker processes, since each conversion is
+    independent and the document parsers are CPU-bound Python. Existing outputs
+    are skipped unless their input changed since it was converted (tracked in
+    .convcache.json by size and modification time) or overwrite is set. A file
+    whose output name matches an earlier file's is skipped.
+
     Args:
         folder_path: Path to the folder to convert
         recursive: Whether to process subdirectories
         verbose: Enable verbose output
         target_format: Target format ('pdf', 'docx', 'md') or None for default
+        workers: Number of worker processes (None = one per CPU, 1 = convert in-process)
+        overwrite: Convert every file even if its output already exists
 
     Returns:
         Tuple of (success_count, error_count, skipped_count)
@@ -192,86 +266,125 @@ def convert_folder(folder_path: Path, recursive: bool = False, verbose: bool = F
         return 0, 0, 0
 
     # Create output directories
-    md_output_dir = folder_path / 'MD'
-    docx_output_dir = folder_path / 'DOCX'
-    pdf_output_dir = folder_path / 'PDF'
-    tex_output_dir = folder_path / 'TEX'
-
-    md_output_dir.mkdir(exist_ok=True)
-    docx_output_dir.mkdir(exist_ok=True)
-    pdf_output_dir.mkdir(exist_ok=True)
-    tex_output_dir.mkdir(exist_ok=True)
+    output_dirs = {name: folder_path / name for name in ('MD', 'DOCX', 'PDF', 'TEX')}
+    for output_dir in output_dirs.values():
+        output_dir.mkdir(exist_ok=True)
 
     if verbose:
         print(f"Created output directories:")
-        print(f"  - {md_output_dir}")
-        print(f"  - {docx_output_dir}")
-        print(f"  - {pdf_output_dir}")
-        print(f"  - {tex_output_dir}")
+        for output_dir in output_dirs.values():
+            print(f"  - {output_dir}")
+
+    # Output paths are built as plain strings in the per-file loop
+    output_dir_strs = {name: str(output_dir) for name, output_dir in output_dirs.items()}
 
     success_count = 0
     error_count = 0
     skipped_count = 0
 
-    # Count files by type for progress
-    md_files = [f for f in files if f.suffix.lower() in MARKDOWN_EXTENSIONS_FOLDER]
-    docx_files = [f for f in files if f.suffix.lower() in DOCX_EXTENSIONS]
-    pdf_files = [f for f in files if f.suffix.lower() in PDF_EXTENSIONS]
-    tex_files = [f for f in files if f.suffix.lower() in TEX_EXTENSIONS]
+    # Count files by type for progress (one pass over the precomputed extensions)
+    counts = dict.fromkeys(ALL_EXTENSIONS_FOLDER, 0)
+    for _, suffix in files:
+        counts[suffix] += 1
 
     print(f"\nFound {len(files)} convertible files:")
-    print(f"  - {len(md_files)} Markdown files")
-    print(f"  - {len(docx_files)} Word files")
-    print(f"  - {len(pdf_files)} PDF files")
-    print(f"  - {len(tex_files)} LaTeX files")
+    print(f"  - {counts['.md'] + counts['.markdown']} Markdown files")
+    print(f"  - {counts['.docx']} Word files")
+    print(f"  - {counts['.pdf']} PDF files")
+    print(f"  - {counts['.tex'] + counts['.latex']} LaTeX files")
     print()
 
-    for i, file_path in enumerate(files, 1):
+    total = len(files)
+
+    def report_error(i, file_path, e):
+        nonlocal error_count
+        print(f"[{i}/{total}] [ERROR] {file_path.name}: {str(e)}", file=sys.stderr)
+        error_count += 1
+        if verbose:
+            import traceback
+            traceback.print_exception(type(e), e, e.__traceback__)
+
+    # Plan every conversion up front; files whose output already exists are skipped
+    cache = _load_conversion_cache(folder_path)
+    fingerprints = {}  # Output path -> (cache key, input fingerprint), recorded once converted
+    planned = set()  # Output paths already claimed by an earlier file in this run
+    jobs = []
+    for i, (file_path, suffix) in enumerate(files, 1):
         try:
-            direction = get_conversion_direction(str(file_path), target_format)
-
+            direction = get_conversion_direction_from_suffix(suffix, target_format)
             # Determine output path based on direction
-            output_info = {
-                'md_to_docx': (docx_output_dir, '.docx', 'MD -> DOCX'),
-                'md_to_pdf': (pdf_output_dir, '.pdf', 'MD -> PDF'),
-                'md_to_tex': (tex_output_dir, '.tex', 'MD -> TEX'),
-                'docx_to_md': (md_output_dir, '.md', 'DOCX -> MD'),
-                'docx_to_pdf': (pdf_output_dir, '.pdf', 'DOCX -> PDF'),
-                'docx_to_tex': (tex_output_dir, '.tex', 'DOCX -> TEX'),
-                'pdf_to_md': (md_output_dir, '.md', 'PDF -> MD'),
-                'pdf_to_docx': (docx_output_dir, '.docx', 'PDF -> DOCX'),
-                'pdf_to_tex': (tex_output_dir, '.tex', 'PDF -> TEX'),
-                'tex_to_md': (md_output_dir, '.md', 'TEX -> MD'),
-                'tex_to_docx': (docx_output_dir, '.docx', 'TEX -> DOCX'),
-            }
-
-            output_dir, suffix, direction_str = output_info[direction]
-            output_filename = file_path.stem + suffix
-            output_path = output_dir / output_filename
-
-            # Check if output already exists
-            if output_path.exists():
+            subdir, output_ext, direction_str = DIRECTION_OUTPUTS[direction]
+            output_name = os.path.splitext(file_path.name)[0] + output_ext
+            output_path = os.path.join(output_dir_strs[subdir], output_name)
+
+            # Inputs sharing a stem (doc.md, doc.markdown, sub/doc.md) map to the same
+            # output; only the first is converted so parallel jobs never share a file
+            if output_path in planned:
                 if verbose:
-                    print(f"[{i}/{len(files)}] [SKIP] {file_path.name} (output exists)")
+                    print(f"[{i}/{total}] [SKIP] {file_path.name} (same output as an earlier file)")
                 skipped_count += 1
                 continue
+            planned.add(output_path)
 
-            if verbose:
-                print(f"[{i}/{len(files)}] Converting: {file_path.name}")
+            st = os.stat(file_path)
+            cache_key = os.path.join(subdir, output_name)
+            fingerprint = [os.path.relpath(file_path, folder_path), st.st_size, st.st_mtime_ns]
 
-            # Convert using the appropriate converter
-            converter = get_converter_for_direction(direction, str(file_path), str(output_path))
-            converter.convert()
+            # Check if output already exists (redone only if its input has changed since)
+            if not overwrite and os.path.exists(output_path) and cache.get(cache_key, fingerprint) == fingerprint:
+                if verbose:
+                    print(f"[{i}/{total}] [SKIP] {file_path.name} (output exists)")
+                skipped_count += 1
+                continue
 
-            print(f"[{i}/{len(files)}] [OK] {direction_str}: {file_path.name} -> {output_path.name}")
-            success_count += 1
+            fingerprints[output_path] = (cache_key, fingerprint)
+            jobs.append((i, file_path, output_path, output_name, direction, direction_str))
 
         except Exception as e:
-            print(f"[{i}/{len(files)}] [ERROR] {file_path.name}: {str(e)}", file=sys.stderr)
-            error_count += 1
+            report_error(i, file_path, e)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers > 1:
+        # Results are reported as they finish, so output order follows completion
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for job in jobs:
+                i, file_path, output_path, _, direction, _ = job
+                if verbose:
+                    print(f"[{i}/{total}] Converting: {file_path.name}")
+                futures[executor.submit(_convert_worker, direction, str(file_path), output_path)] = job
+
+            for future in as_completed(futures):
+                i, file_path, output_path, output_name, _, direction_str = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    report_error(i, file_path, e)
+                    continue
+                print(f"[{i}/{total}] [OK] {direction_str}: {file_path.name} -> {output_name}")
+                success_count += 1
+                cache_key, fingerprint = fingerprints[output_path]
+                cache[cache_key] = fingerprint
+    else:
+        for i, file_path, output_path, output_name, direction, direction_str in jobs:
             if verbose:
-                import traceback
-                traceback.print_exc()
+                print(f"[{i}/{total}] Converting: {file_path.name}")
+            try:
+                # Convert using the appropriate converter
+                _convert_worker(direction, str(file_path), output_path)
+            except Exception as e:
+                report_error(i, file_path, e)
+                continue
+            print(f"[{i}/{total}] [OK] {direction_str}: {file_path.name} -> {output_name}")
+            success_count += 1
+            cache_key, fingerprint = fingerprints[output_path]
+            cache[cache_key] = fingerprint
+
+    if success_count:
+        _save_conversion_cache(folder_path, cache)
 
     return success_count, error_count, skipped_count
 
@@ -376,6 +489,13 @@ Examples:
         help='Force conversion to LaTeX'
     )
 
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of parallel worker processes for folder conversion (default: one per CPU)'
+    )
+
     parser.add_argument(
         '--overwrite',
         action='store_true',
@@ -384,8 +504,16 @@ Examples:
 
     args = parser.parse_args()
 
+    # Stat each input once; the directory check and the dispatch below share the result
+    input_modes = []
+    for input_path in args.input_paths:
+        try:
+            input_modes.append(os.stat(input_path).st_mode)
+        except (OSError, ValueError):
+            input_modes.append(0)  # Missing or unreadable: neither a file nor a folder
+
     # Check if any input is a directory
-    has_directory = any(Path(p).is_dir() for p in args.input_paths)
+    has_directory = any(stat.S_ISDIR(mode) for mode in input_modes)
 
     # Validate arguments
     if args.output and (len(args.input_paths) > 1 or has_directory):
@@ -413,11 +541,10 @@ Examples:
     total_errors = 0
     total_skipped = 0
 
-    for input_path in args.input_paths:
-        path = Path(input_path)
-
-        if path.is_dir():
+    for input_path, mode in zip(args.input_paths, input_modes):
+        if stat.S_ISDIR(mode):
             # Folder conversion mode
+            path = Path(input_path)
             print(f"\n{'='*60}")
             print(f"Processing folder: {path}")
             print('='*60)
@@ -426,14 +553,16 @@ Examples:
                 path,
                 recursive=args.recursive,
                 verbose=args.verbose,
-                target_format=target_format
+                target_format=target_format,
+                workers=args.jobs,
+                overwrite=args.overwrite
             )
 
             total_success += success
             total_errors += errors
             total_skipped += skipped
 
-        elif path.is_file():
+        elif stat.S_ISREG(mode):
             # Single file conversion
             try:
                 if args.verbose:
@@ -447,21 +576,7 @@ Examples:
                     total_skipped += 1
                     continue
 
-                # Direction display strings
-                direction_strings = {
-                    'md_to_docx': 'MD -> DOCX',
-                    'md_to_pdf': 'MD -> PDF',
-                    'md_to_tex': 'MD -> TEX',
-                    'docx_to_md': 'DOCX -> MD',
-                    'docx_to_pdf': 'DOCX -> PDF',
-                    'docx_to_tex': 'DOCX -> TEX',
-                    'pdf_to_md': 'PDF -> MD',
-                    'pdf_to_docx': 'PDF -> DOCX',
-                    'pdf_to_tex': 'PDF -> TEX',
-                    'tex_to_md': 'TEX -> MD',
-                    'tex_to_docx': 'TEX -> DOCX',
-                }
-                direction_str = direction_strings.get(direction, direction)
+                direction_str = DIRECTION_OUTPUTS[direction][2]
 
                 # Create appropriate converter
                 converter = get_converter_for_direction(
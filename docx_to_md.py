@@ -4,11 +4,11 @@ DOCX to Markdown Converter
 Converts Microsoft Word documents (.docx) to Markdown (.md) files
 """
 
+import io
 import re
 import sys
 from pathlib import Path
-from typing import Optional, List
-from xml.etree import ElementTree as ET
+from typing import Optional, TextIO
 
 try:
     from docx import Document
@@ -22,6 +22,29 @@ except ImportError:
     print("Error: python-docx is required. Install it with: pip install python-docx")
     sys.exit(1)
 
+# Qualified tag names, resolved once instead of on every element comparison
+_QN_P = qn('w:p')
+_QN_TBL = qn('w:tbl')
+_QN_R = qn('w:r')
+_QN_T = qn('w:t')
+_QN_HYPERLINK = qn('w:hyperlink')
+_QN_NUMPR = qn('w:numPr')
+_QN_NUMID = qn('w:numId')
+_QN_ILVL = qn('w:ilvl')
+_QN_RID = qn('r:id')
+
+# Precompiled patterns
+_HEADING_RE = re.compile(r'Heading\s*(\d+)')
+_HR_RE = re.compile(r'^[-_]{3,}$')
+
+# Markdown template for a run, keyed by (bold, italic)
+_RUN_FORMATS = {
+    (True, True): '***{}***',
+    (True, False): '**{}**',
+    (False, True): '*{}*',
+    (False, False): '{}',
+}
+
 
 class DocxToMarkdownConverter:
     """Convert Word documents to Markdown files"""
@@ -55,8 +78,13 @@ class DocxToMarkdownConverter:
             self.output_file = self.input_file.with_suffix('.md')
 
         self.doc = Document(str(self.input_file))
-        self.markdown_lines: List[str] = []
+        self._out: Optional[TextIO] = None  # Output stream, open while converting
+        self._last_line: Optional[str] = None  # Last line written (None before the first)
         self._list_state = {'in_list': False, 'list_type': None, 'item_count': 0}
+        self._style_names = {}  # Paragraph style id -> style name (lookups scan styles.xml)
+
+        # Relationship id -> target (hyperlink URL), built once per document
+        self._rel_targets = {r_id: rel.target_ref for r_id, rel in self.doc.part.rels.items()}
 
     def convert(self) -> str:
         """
@@ -65,126 +93,179 @@ class DocxToMarkdownConverter:
         Returns:
             Path to the output file
         """
-        self._process_document()
-
-        # Write the markdown content
-        markdown_content = '\n'.join(self.markdown_lines)
+        # Lines are written as they are produced, so the Markdown is never held in memory
+        try:
+            with open(self.output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                self._out = f
+                self._process_document()
+        except Exception:
+            # Don't leave a half-written file behind (only if we got as far as opening it)
+            if self._out is not None:
+                self.output_file.unlink(missing_ok=True)
+            raise
+        finally:
+            self._out = None
 
-        # Clean up excessive blank lines
-        markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+        return str(self.output_file)
 
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+    def convert_to_string(self) -> str:
+        """
+        Convert the DOCX file to Markdown without writing the output file
 
-        return str(self.output_file)
+        Returns:
+            The Markdown text
+        """
+        buffer = io.StringIO()
+        self._out = buffer
+        try:
+            self._process_document()
+        finally:
+            self._out = None
+        return buffer.getvalue()
 
     def _process_document(self):
         """Process the entire document"""
         for element in self.doc.element.body:
-            if element.tag == qn('w:p'):
+            if element.tag == _QN_P:
                 # It's a paragraph
                 paragraph = Paragraph(element, self.doc)
                 self._process_paragraph(paragraph)
-            elif element.tag == qn('w:tbl'):
+            elif element.tag == _QN_TBL:
                 # It's a table
                 table = Table(element, self.doc)
                 self._process_table(table)
 
     def _process_paragraph(self, paragraph: Paragraph):
         """Process a single paragraph"""
-        # Check if this is a list item
-        is_list_item, list_type = self._is_list_item(paragraph)
+        kind, style_name, list_type = self._classify(paragraph)
 
-        # Get the paragraph style
-        style_name = paragraph.style.name if paragraph.style else 'Normal'
+        # Any non-list paragraph ends an ongoing list
+        if kind != 'list':
+            self._end_list()
 
         # Handle headings
-        if style_name.startswith('Heading'):
-            self._end_list()
+        if kind == 'heading':
             level = self._get_heading_level(style_name)
             text = self._get_formatted_text(paragraph)
             if text.strip():
-                self.markdown_lines.append('')
-                self.markdown_lines.append(f"{'#' * level} {text.strip()}")
-                self.markdown_lines.append('')
-            return
+                self._emit('')
+                self._emit(f"{'#' * level} {text.strip()}")
+                self._emit('')
 
         # Handle list items
-        if is_list_item:
+        elif kind == 'list':
             text = self._get_formatted_text(paragraph)
             if text.strip():
                 if list_type == 'bullet':
-                    self.markdown_lines.append(f"- {text.strip()}")
+                    self._emit(f"- {text.strip()}")
                 else:
                     self._list_state['item_count'] += 1
-                    self.markdown_lines.append(f"{self._list_state['item_count']}. {text.strip()}")
+                    self._emit(f"{self._list_state['item_count']}. {text.strip()}")
                 self._list_state['in_list'] = True
                 self._list_state['list_type'] = list_type
-            return
-
-        # End any ongoing list
-        if self._list_state['in_list']:
-            self._end_list()
 
         # Handle blockquotes (Quote style)
-        if style_name == 'Quote' or style_name == 'Intense Quote':
+        elif kind == 'quote':
             text = self._get_formatted_text(paragraph)
             if text.strip():
-                self.markdown_lines.append(f"> {text.strip()}")
-            return
+                self._emit(f"> {text.strip()}")
 
-        # Handle code blocks (by font name)
-        if self._is_code_block(paragraph):
+        # Handle code blocks (by style or font name)
+        elif kind == 'code':
             text = paragraph.text
             if text.strip():
-                self.markdown_lines.append(f"```")
-                self.markdown_lines.append(text)
-                self.markdown_lines.append(f"```")
-                self.markdown_lines.append('')
-            return
+                self._emit(f"```")
+                self._emit(text)
+                self._emit(f"```")
+                self._emit('')
 
         # Handle horizontal rules
-        if self._is_horizontal_rule(paragraph):
-            self.markdown_lines.append('')
-            self.markdown_lines.append('---')
-            self.markdown_lines.append('')
-            return
+        elif kind == 'hr':
+            self._emit('')
+            self._emit('---')
+            self._emit('')
 
         # Handle regular paragraphs
-        text = self._get_formatted_text(paragraph)
-        if text.strip():
-            self.markdown_lines.append(text.strip())
-            self.markdown_lines.append('')
-        elif self.markdown_lines and self.markdown_lines[-1] != '':
-            # Add blank line for empty paragraphs (but avoid multiple)
-            self.markdown_lines.append('')
+        else:
+            text = self._get_formatted_text(paragraph)
+            if text.strip():
+                self._emit(text.strip())
+                self._emit('')
+            elif self._last_line:
+                # Add blank line for empty paragraphs (but avoid multiple)
+                self._emit('')
+
+    def _classify(self, paragraph: Paragraph) -> tuple:
+        """
+        Classify a paragraph, resolving its style and properties only once
+
+        Returns:
+            Tuple of (kind, style_name, list_type) where kind is one of
+            'heading', 'list', 'quote', 'code', 'hr' or 'text'
+        """
+        style_name = self._get_style_name(paragraph)
+
+        if style_name.startswith('Heading'):
+            return 'heading', style_name, None
+
+        is_list_item, list_type = self._is_list_item(paragraph, style_name)
+        if is_list_item:
+            return 'list', style_name, list_type
+
+        if style_name == 'Quote' or style_name == 'Intense Quote':
+            return 'quote', style_name, None
+
+        if self._is_code_block(paragraph, style_name):
+            return 'code', style_name, None
+
+        if self._is_horizontal_rule(paragraph):
+            return 'hr', style_name, None
+
+        return 'text', style_name, None
+
+    def _get_style_name(self, paragraph: Paragraph) -> str:
+        """Get the paragraph's style name, cached per style id"""
+        style_id = paragraph._element.style
+        style_name = self._style_names.get(style_id)
+        if style_name is None:
+            style = paragraph.style
+            style_name = style.name if style else 'Normal'
+            self._style_names[style_id] = style_name
+        return style_name
+
+    def _emit(self, line: str):
+        """Write an output line, collapsing consecutive blank lines into one"""
+        if line == '' and self._last_line == '':
+            return
+        if self._last_line is not None:
+            self._out.write('\n')
+        self._out.write(line)
+        self._last_line = line
 
     def _end_list(self):
         """End the current list and reset state"""
         if self._list_state['in_list']:
-            self.markdown_lines.append('')
+            self._emit('')
             self._list_state = {'in_list': False, 'list_type': None, 'item_count': 0}
 
-    def _is_list_item(self, paragraph: Paragraph) -> tuple:
+    def _is_list_item(self, paragraph: Paragraph, style_name: str) -> tuple:
         """Check if paragraph is a list item and determine list type"""
         # Check style name
-        style_name = paragraph.style.name if paragraph.style else ''
-
         if 'List Bullet' in style_name:
             return True, 'bullet'
         if 'List Number' in style_name:
             return True, 'numbered'
 
-        # Check for numbering in XML
-        p_element = paragraph._element
-        numPr = p_element.find('.//w:numPr', self.NAMESPACES)
+        # Check for numbering in the paragraph properties
+        p_pr = paragraph._element.pPr
+        numPr = p_pr.find(_QN_NUMPR) if p_pr is not None else None
 
         if numPr is not None:
-            numId = numPr.find('w:numId', self.NAMESPACES)
+            numId = numPr.find(_QN_NUMID)
             if numId is not None:
                 # Try to determine if bullet or numbered
                 # This is a simplified check
-                ilvl = numPr.find('w:ilvl', self.NAMESPACES)
+                ilvl = numPr.find(_QN_ILVL)
                 if ilvl is not None:
                     # Check the numbering definition for type
                     # For simplicity, we'll check common patterns
@@ -196,7 +277,7 @@ class DocxToMarkdownConverter:
 
     def _get_heading_level(self, style_name: str) -> int:
         """Extract heading level from style name"""
-        match = re.search(r'Heading\s*(\d+)', style_name)
+        match = _HEADING_RE.search(style_name)
         if match:
             return min(int(match.group(1)), 6)
         return 1
@@ -206,28 +287,21 @@ class DocxToMarkdownConverter:
         result = []
         p_element = paragraph._element
 
+        # Runs and hyperlinks are direct children of w:p, so no descendant search is needed
         for child in p_element:
-            if child.tag == qn('w:r'):
+            if child.tag == _QN_R:
                 # Direct run - process with formatting
                 text = self._format_run_element(child, paragraph)
                 if text:
                     result.append(text)
 
-            elif child.tag == qn('w:hyperlink'):
+            elif child.tag == _QN_HYPERLINK:
                 # Hyperlink element - extract URL and display text
-                r_id = child.get(qn('r:id'))
-                url = None
-                if r_id:
-                    try:
-                        rel = self.doc.part.rels.get(r_id)
-                        if rel and hasattr(rel, 'target_ref'):
-                            url = rel.target_ref
-                    except Exception:
-                        pass
+                url = self._rel_targets.get(child.get(_QN_RID))
 
                 # Get text from runs inside the hyperlink
                 link_text_parts = []
-                for run_elem in child.findall(qn('w:r')):
+                for run_elem in child.findall(_QN_R):
                     run_text = self._get_run_element_text(run_elem)
                     if run_text:
                         link_text_parts.append(run_text)
@@ -248,29 +322,27 @@ class DocxToMarkdownConverter:
         if not text:
             return ''
 
+        # Runs without run properties have no font, bold or italic to check
+        if run_element.rPr is None:
+            return text
+
         # Check for inline code (monospace font) first
-        if run.font.name and 'courier' in run.font.name.lower():
+        font_name = run.font.name
+        if font_name and 'courier' in font_name.lower():
             return f"`{text}`"
 
         # Apply formatting
-        if run.bold and run.italic:
-            return f"***{text}***"
-        elif run.bold:
-            return f"**{text}**"
-        elif run.italic:
-            return f"*{text}*"
-
-        return text
+        return _RUN_FORMATS[(bool(run.bold), bool(run.italic))].format(text)
 
     def _get_run_element_text(self, run_element) -> str:
         """Extract plain text from a w:r XML element"""
         text_parts = []
-        for t_elem in run_element.findall(qn('w:t')):
+        for t_elem in run_element.findall(_QN_T):
             if t_elem.text:
                 text_parts.append(t_elem.text)
         return ''.join(text_parts)
 
-    def _is_code_block(self, paragraph: Paragraph) -> bool:
+    def _is_code_block(self, paragraph: Paragraph, style_name: str) -> bool:
         """
         Check if paragraph is a code block
 
@@ -280,32 +352,33 @@ class DocxToMarkdownConverter:
 
         This prevents regular monospace text from being treated as code blocks.
         """
-        style_name = paragraph.style.name if paragraph.style else ''
-
         # Check for explicit CodeBlock style
         if 'code' in style_name.lower():
             return True
 
-        # Check paragraph formatting that suggests code block
-        # (e.g., left indent, specific style)
-        if paragraph.paragraph_format.left_indent and paragraph.paragraph_format.left_indent.inches >= 0.3:
-            # Has significant left indent - could be code block
-            # Check if ALL runs have monospace font
-            if paragraph.runs:
-                all_monospace = all(
-                    run.font.name and 'courier' in run.font.name.lower()
-                    for run in paragraph.runs if run.text.strip()
-                )
-                if all_monospace:
-                    return True
-
-        return False
+        # Check if ALL runs have monospace font. Prose fails on its first
+        # non-empty run, so this goes before the indent lookup.
+        runs = paragraph.runs
+        if not runs:
+            return False
+        for run in runs:
+            if run.text.strip():
+                font_name = run.font.name
+                if not (font_name and 'courier' in font_name.lower()):
+                    return False
+
+        # Has significant left indent - monospace and indented is a code block
+        left_indent = paragraph.paragraph_format.left_indent
+        return bool(left_indent and left_indent.inches >= 0.3)
 
     def _is_horizontal_rule(self, paragraph: Paragraph) -> bool:
         """Check if paragraph represents a horizontal rule"""
         text = paragraph.text.strip()
+        # Almost every paragraph fails this cheap test, so skip the regex for them
+        if len(text) < 3 or text[0] not in '-_':
+            return False
         # Check for common horizontal rule patterns
-        if re.match(r'^[-_]{3,}$', text.replace(' ', '')):
+        if _HR_RE.match(text.replace(' ', '')):
             return True
         if text == '_' * 50:  # Our converter creates this
             return True
@@ -316,21 +389,25 @@ class DocxToMarkdownConverter:
         if not table.rows:
             return
 
-        self.markdown_lines.append('')
+        self._emit('')
 
         rows_data = []
+        cell_texts = {}  # Spanned cells repeat the same w:tc; format each one once
         for row in table.rows:
             row_cells = []
             for cell in row.cells:
-                # Get cell text with formatting and hyperlinks
-                parts = []
-                for p in cell.paragraphs:
-                    text = self._get_formatted_text(p).strip()
-                    if text:
-                        parts.append(text)
-                cell_text = ' '.join(parts)
-                # Escape pipe characters in cell content
-                cell_text = cell_text.replace('|', '\\|')
+                tc = cell._tc
+                cell_text = cell_texts.get(tc)
+                if cell_text is None:
+                    # Get cell text with formatting and hyperlinks, reading the
+                    # cell's w:p children without building cell.paragraphs
+                    parts = []
+                    for p_element in tc.iterchildren(_QN_P):
+                        text = self._get_formatted_text(Paragraph(p_element, cell)).strip()
+                        if text:
+                            parts.append(text)
+                    # Escape pipe characters in cell content
+                    cell_text = cell_texts[tc] = ' '.join(parts).replace('|', '\\|')
                 row_cells.append(cell_text)
             rows_data.append(row_cells)
 
@@ -347,17 +424,17 @@ class DocxToMarkdownConverter:
 
         # Create header row
         header = rows_data[0]
-        self.markdown_lines.append('| ' + ' | '.join(header) + ' |')
+        self._emit('| ' + ' | '.join(header) + ' |')
 
         # Create separator row
         separator = '| ' + ' | '.join(['---'] * num_cols) + ' |'
-        self.markdown_lines.append(separator)
+        self._emit(separator)
 
         # Create data rows
         for row in rows_data[1:]:
-            self.markdown_lines.append('| ' + ' | '.join(row) + ' |')
+            self._emit('| ' + ' | '.join(row) + ' |')
 
-        self.markdown_lines.append('')
+        self._emit('')
 
 
 def main():
@@ -4,9 +4,11 @@ DOCX to PDF Converter
 Converts Word documents (.docx) to PDF files by chaining through Markdown
 """
 
+import os
 import sys
 import argparse
-import tempfile
+import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
@@ -47,39 +49,29 @@ class DocxToPdfConverter:
         """
         Convert the DOCX file to PDF
 
-        Strategy: DOCX -> MD (temp) -> PDF
+        Strategy: DOCX -> MD (in memory) -> PDF
         This ensures consistent output by reusing existing converters.
 
         Returns:
             Path to the output file
         """
-        # Create a temporary markdown file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8') as tmp:
-            temp_md_path = tmp.name
-
-        try:
-            # Step 1: Convert DOCX to Markdown
-            docx_to_md = DocxToMarkdownConverter(
-                str(self.input_file),
-                temp_md_path
-            )
-            docx_to_md.convert()
-
-            # Step 2: Convert Markdown to PDF
-            md_to_pdf = MarkdownToPdfConverter(
-                temp_md_path,
-                str(self.output_file)
-            )
-            md_to_pdf.convert()
-
-            return str(self.output_file)
-
-        finally:
-            # Clean up temporary file
-            try:
-                Path(temp_md_path).unlink()
-            except Exception:
-                pass
+        # DOCX -> Markdown -> PDF. The DOCX converter (and its parsed document) is
+        # only referenced while the Markdown is produced, and the PDF converter
+        # drops the Markdown once parsed, so neither is kept through the layout pass
+        md_to_pdf = MarkdownToPdfConverter(
+            str(self.input_file.with_suffix('.md')),
+            str(self.output_file),
+            content=DocxToMarkdownConverter(str(self.input_file)).convert_to_string()
+        )
+        md_to_pdf.feed()
+        md_to_pdf.finalize()
+
+        return str(self.output_file)
+
+
+def _convert_one(input_file: str, output_file: Optional[str] = None) -> str:
+    """Convert one file (module-level so it can be sent to a worker process)"""
+    return DocxToPdfConverter(input_file, output_file).convert()
 
 
 def main():
@@ -112,32 +104,62 @@ Examples:
         help='Enable verbose output'
     )
 
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of parallel worker processes (default: one per CPU)'
+    )
+
     args = parser.parse_args()
 
+    # Expand wildcards here too, for shells that pass them through (e.g. Windows cmd).
+    # Existing paths are kept as-is, so brackets in a real filename aren't a pattern.
+    input_files = []
+    for pattern in args.input_files:
+        if glob.has_magic(pattern) and not os.path.exists(pattern):
+            input_files.extend(sorted(glob.glob(pattern)) or [pattern])
+        else:
+            input_files.append(pattern)
+
     # Validate arguments
-    if args.output and len(args.input_files) > 1:
+    if args.output and len(input_files) > 1:
         print("Error: -o/--output option can only be used with a single input file")
         sys.exit(1)
 
-    # Process each file
-    for input_file in args.input_files:
-        try:
-            if args.verbose:
-                print(f"Converting: {input_file}")
-
-            converter = DocxToPdfConverter(
-                input_file,
-                args.output if args.output else None
-            )
-            output_path = converter.convert()
-
+    def report(input_file, output_path=None, error=None):
+        if error is None:
             print(f"[OK] Converted: {input_file} -> {output_path}")
-
-        except Exception as e:
-            print(f"[ERROR] Error converting {input_file}: {str(e)}", file=sys.stderr)
+            return
+        print(f"[ERROR] Error converting {input_file}: {str(error)}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+    workers = min(args.jobs or os.cpu_count() or 1, len(input_files))
+
+    # Process each file; several files are converted in parallel worker processes
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for input_file in input_files:
+                if args.verbose:
+                    print(f"Converting: {input_file}")
+                futures[executor.submit(_convert_one, input_file, args.output)] = input_file
+
+            for future in as_completed(futures):
+                try:
+                    report(futures[future], future.result())
+                except Exception as e:
+                    report(futures[future], error=e)
+    else:
+        for input_file in input_files:
             if args.verbose:
-                import traceback
-                traceback.print_exc()
+                print(f"Converting: {input_file}")
+            try:
+                report(input_file, _convert_one(input_file, args.output))
+            except Exception as e:
+                report(input_file, error=e)
 
 
 if __name__ == '__main__':
@@ -53,11 +53,9 @@ class DocxToTexConverter:
         Returns:
             Path to the output file
         """
-        # Create a temporary markdown file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8') as tmp:
-            temp_md_path = tmp.name
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_md_path = str(Path(temp_dir) / f'{self.input_file.stem}.md')
 
-        try:
             # Step 1: Convert DOCX to Markdown
             docx_to_md = DocxToMarkdownConverter(
                 str(self.input_file),
@@ -74,13 +72,6 @@ class DocxToTexConverter:
 
             return str(self.output_file)
 
-        finally:
-            # Clean up temporary file
-            try:
-                Path(temp_md_path).unlink()
-            except Exception:
-                pass
-
 
 def main():
     """Main entry point for the script"""
@@ -4,16 +4,21 @@ Markdown to DOCX Converter
 Converts Markdown (.md) files to properly formatted Word documents (.docx)
 """
 
+import os
 import re
 import sys
 import argparse
+import glob
+import io
+from collections import OrderedDict, deque
+from copy import deepcopy
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 try:
     from docx import Document
     from docx.shared import Pt, RGBColor, Inches
-    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
     from docx.enum.style import WD_STYLE_TYPE
     from docx.oxml.ns import qn
     from docx.oxml import OxmlElement
@@ -21,12 +26,141 @@ except ImportError:
     print("Error: python-docx is required. Install it with: pip install python-docx")
     sys.exit(1)
 
-try:
-    import markdown
-    from markdown.extensions import tables, fenced_code, codehilite
-except ImportError:
-    print("Error: markdown is required. Install it with: pip install markdown")
-    sys.exit(1)
+# Characters that can start inline formatting; text between them is copied as-is
+_INLINE_MARKER_RE = re.compile(r'[`*_\[]')
+
+# Block-level line patterns used by _process_markdown
+_RE_HEADER = re.compile(r'^(#{1,6})\s+(.+)$')
+_RE_HR = re.compile(r'^(\*{3,}|-{3,}|_{3,})$')
+_RE_UL = re.compile(r'^[\*\-\+]\s+(.+)$')
+_RE_OL = re.compile(r'^(\d+)\.\s+(.+)$')
+
+# Fonts and colors shared by the styles and the runs built in _make_run /
+# _make_hyperlink (colors as the hex strings written to w:color)
+_MONO_FONT = 'Courier New'
+_INLINE_CODE_COLOR = 'C7254E'  # RGB 199, 37, 78
+_LINK_COLOR = '0000FF'
+
+# Characters python-docx writes as separate run elements rather than text
+_RUN_BREAK_CHARS_RE = re.compile(r'[\t\r\n]')
+
+# Number of distinct formatted lines whose runs are kept for reuse
+_INLINE_CACHE_SIZE = 1024
+
+# Clark name of run text elements, for lxml lookups
+_QN_T = qn('w:t')
+
+# Threads that save finished documents while the CLI renders the next file
+_SAVE_THREADS = 2
+
+# Table separator cells such as '---', ':--:' or '- -'
+_RE_SEP_CELL = re.compile(r'[-: ]*')
+
+
+# Saved copy of the default document with the converter's styles added, so
+# each conversion loads it instead of setting the styles up again
+_template_bytes: Optional[bytes] = None
+
+
+def _get_template_bytes() -> bytes:
+    """
+    Build (once per process) the styled template document
+
+    Returns:
+        The template saved as .docx bytes
+    """
+    global _template_bytes
+    if _template_bytes is None:
+        doc = Document()
+        styles = doc.styles
+
+        # Code block style
+        try:
+            code_style = styles.add_style('CodeBlock', WD_STYLE_TYPE.PARAGRAPH)
+            code_font = code_style.font
+            code_font.name = _MONO_FONT
+            code_font.size = Pt(9)
+            code_style.paragraph_format.left_indent = Inches(0.5)
+            code_style.paragraph_format.space_before = Pt(6)
+            code_style.paragraph_format.space_after = Pt(6)
+        except ValueError:
+            # Style already exists
+            pass
+
+        # Inline code style
+        try:
+            inline_code = styles.add_style('InlineCode', WD_STYLE_TYPE.CHARACTER)
+            inline_code.font.name = _MONO_FONT
+            inline_code.font.size = Pt(10)
+            inline_code.font.color.rgb = RGBColor.from_string(_INLINE_CODE_COLOR)
+        except ValueError:
+            pass
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        _template_bytes = buffer.getvalue()
+    return _template_bytes
+
+
+def _make_run(text: str, bold: bool = False, italic: bool = False, code: bool = False):
+    """
+    Build a <w:r> run element directly
+
+    Produces the same XML as paragraph.add_run() followed by setting the font
+    properties, without creating the Run/Font/ColorFormat wrappers or going
+    through python-docx's schema-ordered child insertion.
+
+    Args:
+        text: The run text
+        bold: Make the run bold
+        italic: Make the run italic
+        code: Format the run as inline code (Courier New, red)
+
+    Returns:
+        The new run element, not yet attached to a paragraph
+    """
+    r = OxmlElement('w:r')
+
+    # rPr children are appended in schema order: rFonts, b, i, color
+    if bold or italic or code:
+        rPr = OxmlElement('w:rPr')
+        if code:
+            fonts = OxmlElement('w:rFonts')
+            fonts.set(qn('w:ascii'), _MONO_FONT)
+            fonts.set(qn('w:hAnsi'), _MONO_FONT)
+            rPr.append(fonts)
+        if bold:
+            rPr.append(OxmlElement('w:b'))
+        if italic:
+            rPr.append(OxmlElement('w:i'))
+        if code:
+            color = OxmlElement('w:color')
+            color.set(qn('w:val'), _INLINE_CODE_COLOR)
+            rPr.append(color)
+        r.append(rPr)
+
+    if text:
+        if _RUN_BREAK_CHARS_RE.search(text):
+            # Let python-docx turn tabs and line breaks into <w:tab/>/<w:br/>
+            r.text = text
+        else:
+            t = OxmlElement('w:t')
+            t.text = text
+            if len(text.strip()) < len(text):
+                t.set(qn('xml:space'), 'preserve')
+            r.append(t)
+
+    return r
+
+
+def _is_blank(p) -> bool:
+    """
+    Check whether a paragraph element has no visible text
+
+    Equivalent to `not paragraph.text.strip()` for the runs this converter
+    builds, but reads the <w:t> text with one lxml call.
+    """
+    return not ''.join(p.itertext(_QN_T)).strip()
 
 
 class MarkdownToDocxConverter:
@@ -35,17 +169,19 @@ class MarkdownToDocxConverter:
     # Supported input extensions
     SUPPORTED_EXTENSIONS = {'.md', '.markdown', '.txt'}
 
-    def __init__(self, input_file: str, output_file: Optional[str] = None):
+    def __init__(self, input_file: str, output_file: Optional[str] = None, content: Optional[str] = None):
         """
         Initialize the converter
 
         Args:
             input_file: Path to the input .md, .markdown, or .txt file
             output_file: Path to the output .docx file (optional)
+            content: Markdown text to convert instead of reading input_file (optional)
         """
         self.input_file = Path(input_file)
+        self.content = content
 
-        if not self.input_file.exists():
+        if content is None and not self.input_file.exists():
             raise FileNotFoundError(f"Input file not found: {input_file}")
 
         if self.input_file.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
@@ -56,34 +192,25 @@ class MarkdownToDocxConverter:
         else:
             self.output_file = self.input_file.with_suffix('.docx')
 
-        self.doc = Document()
-        self._setup_styles()
+        self.doc = Document(io.BytesIO(_get_template_bytes()))
 
-    def _setup_styles(self):
-        """Set up custom styles for the document"""
-        styles = self.doc.styles
+        # Paragraphs are inserted straight into the body XML, before its
+        # closing section properties (where python-docx would put them)
+        self._body = self.doc.element.body
+        self._sect_pr = self._body.sectPr
 
-        # Code block style
-        try:
-            code_style = styles.add_style('CodeBlock', WD_STYLE_TYPE.PARAGRAPH)
-            code_font = code_style.font
-            code_font.name = 'Courier New'
-            code_font.size = Pt(9)
-            code_style.paragraph_format.left_indent = Inches(0.5)
-            code_style.paragraph_format.space_before = Pt(6)
-            code_style.paragraph_format.space_after = Pt(6)
-        except ValueError:
-            # Style already exists
-            pass
+        # Style id for each paragraph style name used so far
+        self._style_ids = {}
 
-        # Inline code style
-        try:
-            inline_code = styles.add_style('InlineCode', WD_STYLE_TYPE.CHARACTER)
-            inline_code.font.name = 'Courier New'
-            inline_code.font.size = Pt(10)
-            inline_code.font.color.rgb = RGBColor(199, 37, 78)
-        except ValueError:
-            pass
+        # Whether the last body paragraph has no visible text; saves walking
+        # doc.paragraphs on every blank line
+        self._last_para_empty = True
+
+        # Inline runs already built for a line of text, most recently used last
+        self._inline_cache = OrderedDict()
+
+        # Hyperlink relationship id for each URL already linked
+        self._url_rid_cache = {}
 
     def convert(self) -> str:
         """
@@ -92,87 +219,105 @@ class MarkdownToDocxConverter:
         Returns:
             Path to the output file
         """
-        # Read the markdown content
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
+        self.render()
+        return self.save()
+
+    def render(self):
+        """Build the Word document from the Markdown input without saving it"""
+        # Read the markdown content as lines; the file's text is not kept once
+        # split, so only one copy of the document is in memory while parsing
+        if self.content is not None:
+            lines = self.content.split('\n')
+        else:
+            lines = self.input_file.read_text(encoding='utf-8').split('\n')
 
         # Process the markdown line by line for better control
-        self._process_markdown(md_content)
+        self._process_markdown(lines)
 
-        # Save the document
+    def save(self) -> str:
+        """
+        Write the rendered document to the output file
+
+        Returns:
+            Path to the output file
+        """
         self.doc.save(str(self.output_file))
         return str(self.output_file)
 
-    def _process_markdown(self, content: str):
-        """Process markdown content and add to document"""
-        lines = content.split('\n')
+    def _process_markdown(self, lines: List[str]):
+        """Process markdown lines and add them to the document"""
         i = 0
-        in_code_block = False
-        code_block_lines = []
+        code_start = None  # Index of the first line inside an open code block
         in_list = False
         list_items = []
 
         while i < len(lines):
             line = lines[i]
+            stripped = line.strip()
+            first = stripped[:1]
 
             # Handle code blocks
-            if line.strip().startswith('```'):
-                if not in_code_block:
-                    in_code_block = True
-                    code_block_lines = []
+            if first == '`' and stripped.startswith('```'):
+                if code_start is None:
+                    code_start = i + 1
                 else:
                     # End of code block
-                    self._add_code_block('\n'.join(code_block_lines))
-                    in_code_block = False
-                    code_block_lines = []
+                    self._add_code_block('\n'.join(lines[code_start:i]))
+                    code_start = None
                 i += 1
                 continue
 
-            if in_code_block:
-                code_block_lines.append(line)
+            if code_start is not None:
                 i += 1
                 continue
 
-            # Handle headers
-            header_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-            if header_match:
-                level = len(header_match.group(1))
-                text = header_match.group(2)
-                self._add_heading(text, level)
-                i += 1
-                continue
+            # Every rule below only matches lines starting with its own
+            # character(s), so dispatch on the first non-blank character
+            if first == '#':
+                # Handle headers
+                header_match = _RE_HEADER.match(line)
+                if header_match:
+                    level = len(header_match.group(1))
+                    text = header_match.group(2)
+                    self._add_heading(text, level)
+                    i += 1
+                    continue
 
-            # Handle horizontal rules
-            if re.match(r'^(\*{3,}|-{3,}|_{3,})$', line.strip()):
-                self.doc.add_paragraph('_' * 50)
-                i += 1
-                continue
+            elif first in ('*', '-', '_', '+'):
+                # Handle horizontal rules
+                if first != '+' and _RE_HR.match(stripped):
+                    self._add_paragraph(text='_' * 50)
+                    self._last_para_empty = False
+                    i += 1
+                    continue
 
-            # Handle unordered lists
-            list_match = re.match(r'^[\*\-\+]\s+(.+)$', line)
-            if list_match:
-                text = list_match.group(1)
-                self._add_bullet(text)
-                i += 1
-                continue
+                # Handle unordered lists
+                if first != '_':
+                    list_match = _RE_UL.match(line)
+                    if list_match:
+                        text = list_match.group(1)
+                        self._add_bullet(text)
+                        i += 1
+                        continue
 
-            # Handle ordered lists
-            ordered_match = re.match(r'^(\d+)\.\s+(.+)$', line)
-            if ordered_match:
-                text = ordered_match.group(2)
-                self._add_numbered_list_item(text)
-                i += 1
-                continue
+            elif first.isdigit():
+                # Handle ordered lists
+                ordered_match = _RE_OL.match(line)
+                if ordered_match:
+                    text = ordered_match.group(2)
+                    self._add_numbered_list_item(text)
+                    i += 1
+                    continue
 
-            # Handle blockquotes
-            if line.strip().startswith('>'):
-                quote_text = line.strip()[1:].strip()
+            elif first == '>':
+                # Handle blockquotes
+                quote_text = stripped[1:].strip()
                 self._add_blockquote(quote_text)
                 i += 1
                 continue
 
-            # Handle tables
-            if '|' in line and line.strip().startswith('|'):
+            elif first == '|':
+                # Handle tables
                 # Collect all table rows
                 table_rows = []
                 while i < len(lines) and '|' in lines[i]:
@@ -183,11 +328,12 @@ class MarkdownToDocxConverter:
                     self._add_table(table_rows)
                 continue
 
-            # Handle empty lines
-            if not line.strip():
+            elif not first:
+                # Handle empty lines
                 # Add a blank line only if the last paragraph isn't already empty
-                if self.doc.paragraphs and self.doc.paragraphs[-1].text.strip():
-                    self.doc.add_paragraph()
+                if not self._last_para_empty:
+                    self._add_paragraph()
+                    self._last_para_empty = True
                 i += 1
                 continue
 
@@ -195,34 +341,83 @@ class MarkdownToDocxConverter:
             self._add_formatted_paragraph(line)
             i += 1
 
+    def _add_paragraph(self, style: Optional[str] = None, text: str = ''):
+        """
+        Append a paragraph to the document body
+
+        Builds the same XML as doc.add_paragraph(text, style), without the
+        python-docx Paragraph/Run wrappers.
+
+        Args:
+            style: Paragraph style name (optional)
+            text: Plain text for the paragraph's single run (optional)
+
+        Returns:
+            The new <w:p> element
+        """
+        p = OxmlElement('w:p')
+
+        if style is not None:
+            if style not in self._style_ids:
+                self._style_ids[style] = self.doc.part.get_style_id(style, WD_STYLE_TYPE.PARAGRAPH)
+            style_id = self._style_ids[style]
+            if style_id is not None:
+                pPr = OxmlElement('w:pPr')
+                p_style = OxmlElement('w:pStyle')
+                p_style.set(qn('w:val'), style_id)
+                pPr.append(p_style)
+                p.append(pPr)
+
+        if text:
+            p.append(_make_run(text))
+
+        if self._sect_pr is not None:
+            self._sect_pr.addprevious(p)
+        else:
+            self._body.append(p)
+        return p
+
     def _add_heading(self, text: str, level: int):
         """Add a heading to the document"""
-        # Clean the text from markdown formatting
-        text = self._clean_text(text)
-        heading_style = f'Heading {min(level, 9)}'
-        self.doc.add_heading(text, level=level)
+        self._emit_paragraph(f'Heading {min(level, 9)}', text)
 
     def _add_formatted_paragraph(self, text: str):
         """Add a paragraph with inline formatting (bold, italic, code, links)"""
-        paragraph = self.doc.add_paragraph()
+        p = self._add_paragraph()
 
         # Process inline formatting
-        self._process_inline_formatting(paragraph, text)
+        self._process_inline_formatting(p, text)
+        self._last_para_empty = _is_blank(p)
+
+    def _emit_paragraph(self, style: str, text: str):
+        """
+        Add a styled paragraph with inline formatting
+
+        Args:
+            style: Paragraph style name
+            text: The markdown text, cleaned before formatting
+        """
+        p = self._add_paragraph(style)
+        self._process_inline_formatting(p, self._clean_text(text))
+        self._last_para_empty = _is_blank(p)
 
-    def _add_hyperlink(self, paragraph, text: str, url: str):
+    def _make_hyperlink(self, text: str, url: str):
         """
-        Add a clickable hyperlink to a paragraph
+        Build a clickable hyperlink element
 
         Args:
-            paragraph: The paragraph to add the link to
             text: The display text for the link
             url: The URL to link to
-        """
-        # Get the document part
-        part = self.doc.part
 
-        # Create relationship for the hyperlink
-        r_id = part.relate_to(url, 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink', is_external=True)
+        Returns:
+            The <w:hyperlink> element, not yet attached to a paragraph
+        """
+        # Create relationship for the hyperlink (relate_to scans every existing
+        # relationship, so repeated URLs reuse the id from the first lookup)
+        r_id = self._url_rid_cache.get(url)
+        if r_id is None:
+            r_id = self.doc.part.relate_to(url, 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink', is_external=True)
+            self._url_rid_cache[url] = r_id
 
         # Create the hyperlink element
         hyperlink = OxmlElement('w:hyperlink')
@@ -234,7 +429,7 @@ class MarkdownToDocxConverter:
 
         # Add blue color
         color = OxmlElement('w:color')
-        color.set(qn('w:val'), '0000FF')
+        color.set(qn('w:val'), _LINK_COLOR)
         rPr.append(color)
 
         # Add underline
@@ -250,127 +445,174 @@ class MarkdownToDocxConverter:
         new_run.append(text_elem)
 
         hyperlink.append(new_run)
-        paragraph._p.append(hyperlink)
+        return hyperlink
+
+    def _process_inline_formatting(self, p, text: str):
+        """
+        Process inline markdown formatting
 
-    def _process_inline_formatting(self, paragraph, text: str):
-        """Process inline markdown formatting"""
-        # Tokenize the text to handle formatting more efficiently
-        # This avoids character-by-character processing
+        Args:
+            p: The <w:p> element to add the runs to
+            text: The markdown text of the paragraph
+        """
+        # Fast path for plain prose: no marker characters means a single run
+        if _INLINE_MARKER_RE.search(text) is None:
+            if text:
+                p.append(_make_run(text))
+            return
 
-        pos = 0
-        buffer = []  # Collect regular text
+        # Repeated lines (table cells, boilerplate bullets) copy the runs built
+        # the first time instead of being parsed again
+        cached = self._inline_cache.get(text)
+        if cached is not None:
+            self._inline_cache.move_to_end(text)
+            p.extend(deepcopy(element) for element in cached)
+            return
+
+        elements = self._build_inline_runs(text)
+
+        # The cache holds the attached elements themselves and copies them only
+        # on reuse. Runs are not modified once attached (bold table headers
+        # are built outside the cache), so the copies match the original parse.
+        self._inline_cache[text] = elements
+        if len(self._inline_cache) > _INLINE_CACHE_SIZE:
+            self._inline_cache.popitem(last=False)
+
+        # Attach all runs in one call
+        p.extend(elements)
+
+    def _build_inline_runs(self, text: str) -> list:
+        """
+        Parse inline markdown into run and hyperlink elements
+
+        Args:
+            text: The text to parse
+
+        Returns:
+            The elements in document order, not yet attached to a paragraph
+        """
+        # Plain text between markers is found by a compiled regex; each marker
+        # then only runs the checks for its own character. Regular text is not
+        # copied until a formatted run (or the end of the text) closes it.
 
-        def flush_buffer():
-            """Add accumulated text to paragraph"""
-            if buffer:
-                paragraph.add_run(''.join(buffer))
-                buffer.clear()
+        pos = 0
+        run_start = 0  # Start of the pending regular text
+        elements = []
+
+        def flush_text(end):
+            """Add the regular text before end as a run"""
+            if run_start < end:
+                elements.append(_make_run(text[run_start:end]))
+
+        # Next position of each closing delimiter. For a given delimiter the
+        # search start only moves forward, so a remembered hit at or after the
+        # new start (or a miss) is still the answer; unclosed markers then
+        # cost one scan in total instead of one scan each.
+        next_at = {}
+
+        def find(delim, start):
+            """text.find(delim, start), reusing the previous search for delim"""
+            hit = next_at.get(delim)
+            if hit is None or -1 < hit < start:
+                hit = text.find(delim, start)
+                next_at[delim] = hit
+            return hit
 
         while pos < len(text):
-            # Check for inline code `code`
-            if text[pos:pos+1] == '`':
-                end = text.find('`', pos + 1)
+            # Jump to the next character that could start formatting
+            marker = _INLINE_MARKER_RE.search(text, pos)
+            if marker is None:
+                break
+            pos = marker.start()
+
+            char = text[pos]
+
+            if char == '`':
+                # Inline code `code`
+                end = find('`', pos + 1)
                 if end != -1:
-                    flush_buffer()
-                    code_text = text[pos+1:end]
-                    run = paragraph.add_run(code_text)
-                    run.font.name = 'Courier New'
-                    run.font.color.rgb = RGBColor(199, 37, 78)
+                    flush_text(pos)
+                    elements.append(_make_run(text[pos+1:end], code=True))
                     pos = end + 1
+                    run_start = pos
                     continue
 
-            # Check for bold+italic ***text*** or ___text___
-            if text[pos:pos+3] in ('***', '___'):
-                delimiter = text[pos:pos+3]
-                end = text.find(delimiter, pos + 3)
-                if end != -1:
-                    flush_buffer()
-                    inner_text = text[pos+3:end]
-                    run = paragraph.add_run(inner_text)
-                    run.bold = True
-                    run.italic = True
-                    pos = end + 3
-                    continue
+            elif char == '[':
+                # Links [text](url)
+                close_bracket = find(']', pos)
+                if close_bracket != -1 and close_bracket + 1 < len(text) and text[close_bracket + 1] == '(':
+                    close_paren = find(')', close_bracket + 2)
+                    if close_paren != -1:
+                        flush_text(pos)
+                        link_text = text[pos+1:close_bracket]
+                        link_url = text[close_bracket+2:close_paren]
+                        # Add actual clickable hyperlink
+                        elements.append(self._make_hyperlink(link_text, link_url))
+                        pos = close_paren + 1
+                        run_start = pos
+                        continue
 
-            # Check for bold **text** or __text__
-            if text[pos:pos+2] in ('**', '__'):
-                delimiter = text[pos:pos+2]
-                end = text.find(delimiter, pos + 2)
-                if end != -1:
-                    flush_buffer()
-                    bold_text = text[pos+2:end]
-                    run = paragraph.add_run(bold_text)
-                    run.bold = True
-                    pos = end + 2
-                    continue
+            else:
+                # Emphasis with * or _: bold+italic, bold, then italic
+                if text.startswith(char * 3, pos):
+                    end = find(char * 3, pos + 3)
+                    if end != -1:
+                        flush_text(pos)
+                        elements.append(_make_run(text[pos+3:end], bold=True, italic=True))
+                        pos = end + 3
+                        run_start = pos
+                        continue
+
+                if text.startswith(char * 2, pos):
+                    end = find(char * 2, pos + 2)
+                    if end != -1:
+                        flush_text(pos)
+                        elements.append(_make_run(text[pos+2:end], bold=True))
+                        pos = end + 2
+                        run_start = pos
+                        continue
 
-            # Check for italic *text* or _text_ (but not part of ** or __)
-            if text[pos:pos+1] in ('*', '_'):
-                # Make sure it's not part of ** or __
-                if pos > 0 and text[pos-1] == text[pos]:
-                    buffer.append(text[pos])
+                # Italic *text* or _text_ (but not part of ** or __)
+                if pos > 0 and text[pos-1] == char:
                     pos += 1
                     continue
-                if pos + 1 < len(text) and text[pos+1] == text[pos]:
+                if pos + 1 < len(text) and text[pos+1] == char:
                     # This is start of ** or __, skip
                     pass
                 else:
-                    delimiter = text[pos:pos+1]
-                    end = text.find(delimiter, pos + 1)
+                    end = find(char, pos + 1)
                     if end != -1 and end > pos + 1:
                         # Check it's not part of ** or __
-                        if end + 1 >= len(text) or text[end+1] != delimiter:
-                            flush_buffer()
-                            italic_text = text[pos+1:end]
-                            run = paragraph.add_run(italic_text)
-                            run.italic = True
+                        if end + 1 >= len(text) or text[end+1] != char:
+                            flush_text(pos)
+                            elements.append(_make_run(text[pos+1:end], italic=True))
                             pos = end + 1
+                            run_start = pos
                             continue
 
-            # Check for links [text](url)
-            if text[pos:pos+1] == '[':
-                close_bracket = text.find(']', pos)
-                if close_bracket != -1 and close_bracket + 1 < len(text) and text[close_bracket + 1] == '(':
-                    close_paren = text.find(')', close_bracket + 2)
-                    if close_paren != -1:
-                        flush_buffer()
-                        link_text = text[pos+1:close_bracket]
-                        link_url = text[close_bracket+2:close_paren]
-                        # Add actual clickable hyperlink
-                        self._add_hyperlink(paragraph, link_text, link_url)
-                        pos = close_paren + 1
-                        continue
-
-            # Regular text - add to buffer
-            buffer.append(text[pos])
+            # Regular text - leave it in the pending run
             pos += 1
 
         # Flush any remaining text
-        flush_buffer()
+        flush_text(len(text))
+        return elements
 
     def _add_bullet(self, text: str):
         """Add a bullet point"""
-        text = self._clean_text(text)
-        paragraph = self.doc.add_paragraph(style='List Bullet')
-        self._process_inline_formatting(paragraph, text)
+        self._emit_paragraph('List Bullet', text)
 
     def _add_numbered_list_item(self, text: str):
         """Add a numbered list item"""
-        text = self._clean_text(text)
-        paragraph = self.doc.add_paragraph(style='List Number')
-        self._process_inline_formatting(paragraph, text)
+        self._emit_paragraph('List Number', text)
 
     def _add_blockquote(self, text: str):
         """Add a blockquote"""
-        text = self._clean_text(text)
-        paragraph = self.doc.add_paragraph()
-        paragraph.style = 'Quote'
-        self._process_inline_formatting(paragraph, text)
+        self._emit_paragraph('Quote', text)
 
     def _add_code_block(self, code: str):
         """Add a code block"""
-        paragraph = self.doc.add_paragraph(code)
-        paragraph.style = 'CodeBlock'
+        self._add_paragraph('CodeBlock', code)
+        self._last_para_empty = not code.strip()
 
     def _add_table(self, table_rows: list):
         """Add a table to the document"""
@@ -380,17 +622,16 @@ class MarkdownToDocxConverter:
         # Parse table rows into cells
         parsed_rows = []
         for row in table_rows:
-            # Split by | and clean up
-            cells = [cell.strip() for cell in row.split('|')]
-
-            # Remove empty first/last elements (from leading/trailing |)
-            if cells and cells[0] == '':
-                cells = cells[1:]
-            if cells and cells[-1] == '':
-                cells = cells[:-1]
+            # Split by |, leaving out the empty pieces before a leading and
+            # after a trailing |
+            row = row.strip()
+            parts = row.split('|')
+            first = 1 if row.startswith('|') else 0
+            last = len(parts) - 1 if row.endswith('|') else len(parts)
+            cells = [cell.strip() for cell in parts[first:last]]
 
             # Filter out the separator row (contains only - and :)
-            if cells and not all(set(cell.replace('-', '').replace(':', '').replace(' ', '')) == set() for cell in cells):
+            if cells and not all(_RE_SEP_CELL.fullmatch(cell) for cell in cells):
                 parsed_rows.append(cells)
 
         if not parsed_rows:
@@ -414,15 +655,19 @@ class MarkdownToDocxConverter:
                     # Create a paragraph in the cell
                     cell.text = ''  # Clear default text
                     paragraph = cell.paragraphs[0]
-                    self._process_inline_formatting(paragraph, cell_text)
 
-                    # Make header row bold
                     if i == 0:
+                        # Make header row bold; these runs are changed after
+                        # parsing, so they are not shared with the inline cache
+                        paragraph._p.extend(self._build_inline_runs(cell_text))
                         for run in paragraph.runs:
                             run.bold = True
+                    else:
+                        self._process_inline_formatting(paragraph._p, cell_text)
 
         # Add spacing after table
-        self.doc.add_paragraph()
+        self._add_paragraph()
+        self._last_para_empty = True
 
     def _clean_text(self, text: str) -> str:
         """Clean text from simple markdown artifacts"""
@@ -430,6 +675,11 @@ class MarkdownToDocxConverter:
         return text.strip()
 
 
+def _convert_one(input_file: str, output_file: Optional[str] = None) -> str:
+    """Convert one file (module-level so it can be sent to a worker process)"""
+    return MarkdownToDocxConverter(input_file, output_file).convert()
+
+
 def main():
     """Main entry point for the script"""
     parser = argparse.ArgumentParser(
@@ -460,32 +710,86 @@ Examples:
         help='Enable verbose output'
     )
 
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of parallel worker processes (default: one per CPU)'
+    )
+
     args = parser.parse_args()
 
+    # Expand wildcards here too, for shells that pass them through (e.g. Windows cmd).
+    # Existing paths are kept as-is, so brackets in a real filename aren't a pattern.
+    input_files = []
+    for pattern in args.input_files:
+        if glob.has_magic(pattern) and not os.path.exists(pattern):
+            input_files.extend(sorted(glob.glob(pattern)) or [pattern])
+        else:
+            input_files.append(pattern)
+
     # Validate arguments
-    if args.output and len(args.input_files) > 1:
+    if args.output and len(input_files) > 1:
         print("Error: -o/--output option can only be used with a single input file")
         sys.exit(1)
 
-    # Process each file
-    for input_file in args.input_files:
-        try:
-            if args.verbose:
-                print(f"Converting: {input_file}")
-
-            converter = MarkdownToDocxConverter(
-                input_file,
-                args.output if args.output else None
-            )
-            output_path = converter.convert()
-
+    def report(input_file, output_path=None, error=None):
+        if error is None:
             print(f"[OK] Converted: {input_file} -> {output_path}")
+            return
+        print(f"[ERROR] Error converting {input_file}: {str(error)}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+    workers = min(args.jobs or os.cpu_count() or 1, len(input_files))
+
+    # Process each file; several files are converted in parallel worker processes
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for input_file in input_files:
+                if args.verbose:
+                    print(f"Converting: {input_file}")
+                futures[executor.submit(_convert_one, input_file, args.output)] = input_file
+
+            for future in as_completed(futures):
+                try:
+                    report(futures[future], future.result())
+                except Exception as e:
+                    report(futures[future], error=e)
+    else:
+        # Saving (XML serialization, compression, disk writes) runs in threads
+        # so it overlaps with rendering the next file
+        def report_save(input_file, future):
+            try:
+                report(input_file, future.result())
+            except Exception as e:
+                report(input_file, error=e)
+
+        with ThreadPoolExecutor(max_workers=_SAVE_THREADS) as saver:
+            pending = deque()
+            for input_file in input_files:
+                if args.verbose:
+                    print(f"Converting: {input_file}")
+                try:
+                    converter = MarkdownToDocxConverter(input_file, args.output)
+                    converter.render()
+                except Exception as e:
+                    # Queued behind the pending saves so results stay in input order
+                    future = Future()
+                    future.set_exception(e)
+                else:
+                    future = saver.submit(converter.save)
+                pending.append((input_file, future))
+
+                # Report finished saves, and keep at most one rendered
+                # document per save thread in memory
+                while pending and (len(pending) > _SAVE_THREADS or pending[0][1].done()):
+                    report_save(*pending.popleft())
 
-        except Exception as e:
-            print(f"[ERROR] Error converting {input_file}: {str(e)}", file=sys.stderr)
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
+            while pending:
+                report_save(*pending.popleft())
 
 
 if __name__ == '__main__':
@@ -25,6 +25,39 @@ except ImportError:
     print("Error: reportlab is required. Install it with: pip install reportlab")
     sys.exit(1)
 
+# Block-level line patterns used by _process_markdown
+_RE_HEADER = re.compile(r'^(#{1,6})\s+(.+)$')
+_RE_HR = re.compile(r'^(\*{3,}|-{3,}|_{3,})$')
+_RE_UL = re.compile(r'^[\*\-\+]\s+(.+)$')
+_RE_OL = re.compile(r'^(\d+)\.\s+(.+)$')
+
+# Inline Markdown -> ReportLab markup substitutions, applied in this order
+_INLINE_SUBS = (
+    # Inline code: `code` -> <font face="Courier" color="#c7254e">code</font>
+    (re.compile(r'`([^`]+)`'), r'<font face="Courier" color="#c7254e">\1</font>'),
+    # Links first (before other processing can interfere)
+    (re.compile(r'\[([^\]]+)\]\(([^)]+)\)'), r'<link href="\2"><u><font color="blue">\1</font></u></link>'),
+    # Remove strikethrough markers (not supported in ReportLab Paragraph)
+    (re.compile(r'~~([^~]+)~~'), r'\1'),
+    # Mixed bold+italic patterns: **_text_** or _**text**_ or *__text__* etc.
+    (re.compile(r'\*\*_([^_*]+)_\*\*'), r'<b><i>\1</i></b>'),
+    (re.compile(r'_\*\*([^_*]+)\*\*_'), r'<i><b>\1</b></i>'),
+    (re.compile(r'\*__([^_*]+)__\*'), r'<i><b>\1</b></i>'),
+    (re.compile(r'__\*([^_*]+)\*__'), r'<b><i>\1</i></b>'),
+    # Bold and italic: ***text*** or ___text___
+    (re.compile(r'\*\*\*([^*]+)\*\*\*'), r'<b><i>\1</i></b>'),
+    (re.compile(r'___([^_]+)___'), r'<b><i>\1</i></b>'),
+    # Bold: **text** or __text__
+    (re.compile(r'\*\*([^*]+)\*\*'), r'<b>\1</b>'),
+    (re.compile(r'__([^_]+)__'), r'<b>\1</b>'),
+    # Italic: *text* or _text_
+    (re.compile(r'(?<!\*)\*([^*]+)\*(?!\*)'), r'<i>\1</i>'),
+    (re.compile(r'(?<!_)_([^_]+)_(?!_)'), r'<i>\1</i>'),
+    # Clean up any remaining isolated markers
+    (re.compile(r'(?<!\w)\*+(?!\w)'), ''),
+    (re.compile(r'(?<!\w)_+(?!\w)'), ''),
+)
+
 
 class MarkdownToPdfConverter:
     """Convert Markdown files to PDF documents"""
@@ -32,17 +65,19 @@ class MarkdownToPdfConverter:
     # Supported input extensions
     SUPPORTED_EXTENSIONS = {'.md', '.markdown', '.txt'}
 
-    def __init__(self, input_file: str, output_file: Optional[str] = None):
+    def __init__(self, input_file: str, output_file: Optional[str] = None, content: Optional[str] = None):
         """
         Initialize the converter
 
         Args:
             input_file: Path to the input .md, .markdown, or .txt file
             output_file: Path to the output .pdf file (optional)
+            content: Markdown text to convert instead of reading input_file (optional)
         """
         self.input_file = Path(input_file)
+        self.content = content
 
-        if not self.input_file.exists():
+        if content is None and not self.input_file.exists():
             raise FileNotFoundError(f"Input file not found: {input_file}")
 
         if self.input_file.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
@@ -53,6 +88,9 @@ class MarkdownToPdfConverter:
         else:
             self.output_file = self.input_file.with_suffix('.pdf')
 
+        # Flowables parsed by feed() and laid out by finalize()
+        self._story = []
+
         self._setup_styles()
 
     def _setup_styles(self):
@@ -156,10 +194,37 @@ class MarkdownToPdfConverter:
         Returns:
             Path to the output file
         """
-        # Read the markdown content
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
+        self.feed()
+        return self.finalize()
+
+    def feed(self, content: Optional[str] = None):
+        """
+        Parse Markdown into PDF flowables
+
+        The converter keeps no reference to the Markdown text afterwards, so
+        it can be freed before the layout pass in finalize().
+
+        Args:
+            content: Markdown text to parse (default: the content given to
+                __init__, or the input file)
+        """
+        if content is None:
+            if self.content is not None:
+                content = self.content
+            else:
+                with open(self.input_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
+        self.content = None
+
+        self._story.extend(self._process_markdown(content))
+
+    def finalize(self) -> str:
+        """
+        Lay out the parsed flowables and write the PDF
 
+        Returns:
+            Path to the output file
+        """
         # Create PDF document
         doc = SimpleDocTemplate(
             str(self.output_file),
@@ -170,10 +235,8 @@ class MarkdownToPdfConverter:
             bottomMargin=2.5*cm
         )
 
-        # Build the story (list of flowables)
-        story = self._process_markdown(md_content)
-
         # Build PDF
+        story, self._story = self._story, []
         doc.build(story)
 
         return str(self.output_file)
@@ -232,7 +295,7 @@ class MarkdownToPdfConverter:
                 # Don't increment i, process current line
 
             # Handle headers
-            header_match = re.match(r'^(#{1,6})\s+(.+)$', line)
+            header_match = _RE_HEADER.match(line)
             if header_match:
                 level = len(header_match.group(1))
                 text = self._process_inline_formatting(header_match.group(2))
@@ -244,18 +307,18 @@ class MarkdownToPdfConverter:
                 continue
 
             # Handle horizontal rules
-            if re.match(r'^(\*{3,}|-{3,}|_{3,})$', line.strip()):
+            if _RE_HR.match(line.strip()):
                 story.append(HRFlowable(width="100%", thickness=1, color=HexColor('#bdc3c7')))
                 story.append(Spacer(1, 12))
                 i += 1
                 continue
 
             # Handle unordered lists
-            list_match = re.match(r'^[\*\-\+]\s+(.+)$', line)
+            list_match = _RE_UL.match(line)
             if list_match:
                 items = []
                 while i < len(lines):
-                    lm = re.match(r'^[\*\-\+]\s+(.+)$', lines[i])
+                    lm = _RE_UL.match(lines[i])
                     if lm:
                         text = self._process_inline_formatting(lm.group(1))
                         items.append(ListItem(Paragraph(text, self.styles['ListItem']), leftIndent=20, bulletColor=black))
@@ -268,12 +331,12 @@ class MarkdownToPdfConverter:
                 continue
 
             # Handle ordered lists
-            ordered_match = re.match(r'^(\d+)\.\s+(.+)$', line)
+            ordered_match = _RE_OL.match(line)
             if ordered_match:
                 items = []
                 start_num = int(ordered_match.group(1))  # Preserve starting number
                 while i < len(lines):
-                    om = re.match(r'^(\d+)\.\s+(.+)$', lines[i])
+                    om = _RE_OL.match(lines[i])
                     if om:
                         text = self._process_inline_formatting(om.group(2))
                         items.append(ListItem(Paragraph(text, self.styles['ListItem']), leftIndent=20))
@@ -325,40 +388,9 @@ class MarkdownToPdfConverter:
         text = text.replace('<', '&lt;')
         text = text.replace('>', '&gt;')
 
-        # Inline code: `code` -> <font face="Courier" color="#c7254e">code</font>
-        text = re.sub(r'`([^`]+)`', r'<font face="Courier" color="#c7254e">\1</font>', text)
-
-        # Links first (before other processing can interfere)
-        text = re.sub(
-            r'\[([^\]]+)\]\(([^)]+)\)',
-            r'<link href="\2"><u><font color="blue">\1</font></u></link>',
-            text
-        )
-
-        # Remove strikethrough markers (not supported in ReportLab Paragraph)
-        text = re.sub(r'~~([^~]+)~~', r'\1', text)
-
-        # Mixed bold+italic patterns: **_text_** or _**text**_ or *__text__* etc.
-        text = re.sub(r'\*\*_([^_*]+)_\*\*', r'<b><i>\1</i></b>', text)
-        text = re.sub(r'_\*\*([^_*]+)\*\*_', r'<i><b>\1</b></i>', text)
-        text = re.sub(r'\*__([^_*]+)__\*', r'<i><b>\1</b></i>', text)
-        text = re.sub(r'__\*([^_*]+)\*__', r'<b><i>\1</i></b>', text)
-
-        # Bold and italic: ***text*** or ___text___
-        text = re.sub(r'\*\*\*([^*]+)\*\*\*', r'<b><i>\1</i></b>', text)
-        text = re.sub(r'___([^_]+)___', r'<b><i>\1</i></b>', text)
-
-        # Bold: **text** or __text__
-        text = re.sub(r'\*\*([^*]+)\*\*', r'<b>\1</b>', text)
-        text = re.sub(r'__([^_]+)__', r'<b>\1</b>', text)
-
-        # Italic: *text* or _text_
-        text = re.sub(r'(?<!\*)\*([^*]+)\*(?!\*)', r'<i>\1</i>', text)
-        text = re.sub(r'(?<!_)_([^_]+)_(?!_)', r'<i>\1</i>', text)
-
-        # Clean up any remaining isolated markers
-        text = re.sub(r'(?<!\w)\*+(?!\w)', '', text)
-        text = re.sub(r'(?<!\w)_+(?!\w)', '', text)
+        # Markdown markers -> ReportLab markup, in the order of _INLINE_SUBS
+        for pattern, replacement in _INLINE_SUBS:
+            text = pattern.sub(replacement, text)
 
         return text
 
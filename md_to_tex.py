@@ -10,6 +10,39 @@ import argparse
 from pathlib import Path
 from typing import Optional, List
 
+# Block-level line patterns used by _process_markdown
+_RE_HEADER = re.compile(r'^(#{1,6})\s+(.+)$')
+_RE_HR = re.compile(r'^(\*{3,}|-{3,}|_{3,})$')
+_RE_UL = re.compile(r'^[\*\-\+]\s+(.+)$')
+_RE_OL = re.compile(r'^(\d+)\.\s+(.+)$')
+
+# Opening or closing code fence, with an optional language name
+_RE_CODE_FENCE = re.compile(r'^```(\w*)$')
+
+# Existing LaTeX commands (backslash followed by letters)
+_RE_LATEX_COMMAND = re.compile(r'\\[a-zA-Z]+')
+
+# Inline Markdown -> LaTeX substitutions, applied in this order
+_INLINE_SUBS = (
+    # Inline code: `code` -> \texttt{code}
+    (re.compile(r'`([^`]+)`'), r'\\texttt{\1}'),
+    # Links: [text](url) -> \href{url}{text}
+    (re.compile(r'\[([^\]]+)\]\(([^)]+)\)'), r'\\href{\2}{\1}'),
+    # Images: ![alt](url) -> (not embedded, just text)
+    (re.compile(r'!\[([^\]]*)\]\([^)]+\)'), r'[Image: \1]'),
+    # Bold and italic: ***text*** or ___text___
+    (re.compile(r'\*\*\*([^*]+)\*\*\*'), r'\\textbf{\\textit{\1}}'),
+    (re.compile(r'___([^_]+)___'), r'\\textbf{\\textit{\1}}'),
+    # Bold: **text** or __text__
+    (re.compile(r'\*\*([^*]+)\*\*'), r'\\textbf{\1}'),
+    (re.compile(r'__([^_]+)__'), r'\\textbf{\1}'),
+    # Italic: *text* or _text_
+    (re.compile(r'(?<!\*)\*([^*]+)\*(?!\*)'), r'\\textit{\1}'),
+    (re.compile(r'(?<!_)_([^_]+)_(?!_)'), r'\\textit{\1}'),
+    # Strikethrough: ~~text~~ -> \sout{text} (requires ulem package, skip for now)
+    (re.compile(r'~~([^~]+)~~'), r'\1'),
+)
+
 
 class MarkdownToTexConverter:
     """Convert Markdown files to LaTeX documents"""
@@ -119,7 +152,7 @@ class MarkdownToTexConverter:
             line = lines[i]
 
             # Handle code blocks
-            code_match = re.match(r'^```(\w*)$', line.strip())
+            code_match = _RE_CODE_FENCE.match(line.strip())
             if code_match is not None:
                 if not in_code_block:
                     # Close any open list
@@ -163,7 +196,7 @@ class MarkdownToTexConverter:
                 # Don't increment i, process current line
 
             # Handle headers
-            header_match = re.match(r'^(#{1,6})\s+(.+)$', line)
+            header_match = _RE_HEADER.match(line)
             if header_match:
                 # Close any open list
                 if in_list:
@@ -176,7 +209,7 @@ class MarkdownToTexConverter:
                 continue
 
             # Handle horizontal rules
-            if re.match(r'^(\*{3,}|-{3,}|_{3,})$', line.strip()):
+            if _RE_HR.match(line.strip()):
                 # Close any open list
                 if in_list:
                     output_lines.append(self._close_list(list_type))
@@ -186,7 +219,7 @@ class MarkdownToTexConverter:
                 continue
 
             # Handle unordered lists
-            list_match = re.match(r'^[\*\-\+]\s+(.+)$', line)
+            list_match = _RE_UL.match(line)
             if list_match:
                 if not in_list or list_type != 'itemize':
                     if in_list:
@@ -200,7 +233,7 @@ class MarkdownToTexConverter:
                 continue
 
             # Handle ordered lists
-            ordered_match = re.match(r'^(\d+)\.\s+(.+)$', line)
+            ordered_match = _RE_OL.match(line)
             if ordered_match:
                 if not in_list or list_type != 'enumerate':
                     if in_list:
@@ -277,29 +310,9 @@ class MarkdownToTexConverter:
         # Temporarily protect markdown formatting
         text = self._escape_latex_special_chars(text)
 
-        # Inline code: `code` -> \texttt{code}
-        text = re.sub(r'`([^`]+)`', r'\\texttt{\1}', text)
-
-        # Links: [text](url) -> \href{url}{text}
-        text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'\\href{\2}{\1}', text)
-
-        # Images: ![alt](url) -> (not embedded, just text)
-        text = re.sub(r'!\[([^\]]*)\]\([^)]+\)', r'[Image: \1]', text)
-
-        # Bold and italic: ***text*** or ___text___
-        text = re.sub(r'\*\*\*([^*]+)\*\*\*', r'\\textbf{\\textit{\1}}', text)
-        text = re.sub(r'___([^_]+)___', r'\\textbf{\\textit{\1}}', text)
-
-        # Bold: **text** or __text__
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\\textbf{\1}', text)
-        text = re.sub(r'__([^_]+)__', r'\\textbf{\1}', text)
-
-        # Italic: *text* or _text_
-        text = re.sub(r'(?<!\*)\*([^*]+)\*(?!\*)', r'\\textit{\1}', text)
-        text = re.sub(r'(?<!_)_([^_]+)_(?!_)', r'\\textit{\1}', text)
-
-        # Strikethrough: ~~text~~ -> \sout{text} (requires ulem package, skip for now)
-        text = re.sub(r'~~([^~]+)~~', r'\1', text)
+        # Markdown markers -> LaTeX commands, in the order of _INLINE_SUBS
+        for pattern, replacement in _INLINE_SUBS:
+            text = pattern.sub(replacement, text)
 
         return text
 
@@ -316,7 +329,7 @@ class MarkdownToTexConverter:
             protected.append(match.group(0))
             return f'\x00PROTECTED{len(protected)-1}\x00'
 
-        text = re.sub(r'\\[a-zA-Z]+', protect_commands, text)
+        text = _RE_LATEX_COMMAND.sub(protect_commands, text)
 
         # Escape special characters
         text = text.replace('\\', '\\textbackslash{}')
@@ -545,11 +545,29 @@ async function convertBatch() {
     }
 
     try {
-        const response = await fetchWithRetry('/convert-batch', {
+        // Queue the batch; the server converts in the background
+        const jobResponse = await fetchWithRetry('/convert-batch?async=1', {
             method: 'POST',
             body: formData
         });
 
+        if (!jobResponse.ok) {
+            let errorMessage = 'Batch conversion failed';
+            try {
+                const errorData = await jobResponse.json();
+                errorMessage = errorData.error || errorMessage;
+            } catch (jsonError) {
+                // Response wasn't JSON, use status text
+                errorMessage = jobResponse.statusText || errorMessage;
+            }
+            throw new Error(errorMessage);
+        }
+
+        const job = await jobResponse.json();
+        await waitForBatchJob(job);
+
+        const response = await fetchWithTimeout(job.download_url);
+
         if (!response.ok) {
             let errorMessage = 'Batch conversion failed';
             try {
@@ -582,6 +600,31 @@ async function convertBatch() {
     }
 }
 
+// Follow batch job progress via Server-Sent Events
+function waitForBatchJob(job) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(job.progress_url);
+
+        source.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+            if (data.stage === 'converting') {
+                updateProgressText(`Converting... ${data.done}/${data.total} files (${data.pct}%)`);
+            } else if (data.stage === 'done') {
+                source.close();
+                resolve(data);
+            } else if (data.stage === 'failed') {
+                source.close();
+                reject(new Error(data.error || 'Batch conversion failed'));
+            }
+        };
+
+        source.onerror = () => {
+            source.close();
+            reject(new Error('Lost connection to the server during conversion. Please try again.'));
+        };
+    });
+}
+
 // Download response helper
 async function downloadResponse(response, fallbackName, targetFormat) {
     const blob = await response.blob();
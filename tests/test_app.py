@@ -0,0 +1,117 @@
+"""Tests for the Flask web application (run with: python -m unittest discover tests)"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from werkzeug.datastructures import FileStorage
+from werkzeug.test import stream_encode_multipart
+
+from app import app
+
+# Larger than the 64KB upload spool threshold, so the upload goes to disk
+LARGE_MARKDOWN = ('# Title\n\n' + 'Paragraph with **bold** and `code`.\n' * 8000).encode()
+
+
+def large_upload(filename):
+    """A large Markdown upload for the multipart encoder"""
+    return FileStorage(io.BytesIO(LARGE_MARKDOWN), filename)
+
+
+class LargeUploadTests(unittest.TestCase):
+    """Uploads above the in-memory thresholds convert instead of being rejected"""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+        # Record the request temp directories so the tests can check they are removed
+        self.temp_dirs = []
+        real_mkdtemp = tempfile.mkdtemp
+
+        def mkdtemp(*args, **kwargs):
+            path = real_mkdtemp(*args, **kwargs)
+            self.temp_dirs.append(path)
+            return path
+
+        patcher = mock.patch('tempfile.mkdtemp', side_effect=mkdtemp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post_files(self, url, data):
+        """POST a multipart form, encoded in memory (the test client spools large
+        bodies to a temp file of its own and never closes it)"""
+        stream, length, boundary = stream_encode_multipart(data, use_tempfile=False)
+        return self.client.post(
+            url,
+            input_stream=stream,
+            content_length=length,
+            content_type=f'multipart/form-data; boundary={boundary}',
+        )
+
+    def assertTempDirsRemoved(self):
+        self.assertTrue(self.temp_dirs)
+        for path in self.temp_dirs:
+            self.assertFalse(os.path.exists(path), path)
+
+    def test_convert_large_markdown(self):
+        with self.post_files('/convert', {'file': large_upload('large.md')}) as response:
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.data.startswith(b'PK\x03\x04'))
+        self.assertTempDirsRemoved()
+
+    def test_convert_batch_large_markdown(self):
+        files = [large_upload('first.md'), large_upload('second.md')]
+        with self.post_files('/convert-batch', {'files': files}) as response:
+            self.assertEqual(response.status_code, 200)
+            with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+                self.assertEqual(sorted(zf.namelist()), ['DOCX/first.docx', 'DOCX/second.docx'])
+        self.assertTempDirsRemoved()
+
+
+class BatchJobProgressTests(unittest.TestCase):
+    """Progress streams of queued batch jobs end once the job has finished"""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def read_events(self, job_id):
+        with self.client.get(f'/progress/{job_id}') as response:
+            self.assertEqual(response.status_code, 200)
+            return [
+                json.loads(line[len('data: '):])
+                for line in response.get_data(as_text=True).splitlines()
+                if line.startswith('data: ')
+            ]
+
+    def test_late_listener_gets_final_event(self):
+        with self.client.post(
+            '/convert-batch?async=1',
+            data={'files': [
+                (io.BytesIO(b'# One\n'), 'one.md'),
+                (io.BytesIO(b'# Two\n'), 'two.md'),
+            ]},
+            content_type='multipart/form-data',
+        ) as response:
+            self.assertEqual(response.status_code, 202)
+            job_id = response.get_json()['job_id']
+
+        # The first listener consumes the queued done event; a second one
+        # (or a reconnect) still gets the final status instead of keepalives
+        self.assertEqual(self.read_events(job_id)[-1]['stage'], 'done')
+        final = self.read_events(job_id)
+        self.assertEqual(len(final), 1)
+        self.assertEqual(final[0]['stage'], 'done')
+        self.assertEqual(final[0]['converted'], 2)
+
+        with self.client.get(f'/download/{job_id}') as response:
+            self.assertEqual(response.status_code, 200)
+        with self.client.get(f'/progress/{job_id}') as response:
+            self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()